@@ -0,0 +1,210 @@
+# batch_categorize.py
+#-----------------------------------------------------------
+# Non-interactive batch categorization for grocery-list.py
+#
+# Streams list files (or stdin) through a generator pipeline
+#     read -> normalize -> categorize -> emit
+# and writes one JSON object per item (JSON Lines), so arbitrarily
+# large dumps of historical lists run in constant memory.
+#
+# With jobs > 1 the categorize and encode stages run in a process
+# pool.  Each worker loads the compiled keyword index once, handles
+# chunks of lines, and results are written back in input order.  When
+# the caller's Categorizer counts work (--metrics) or records keyword
+# hits (--keyword-stats), each chunk's counters and hits come back with
+# its results and are added to the caller's.
+#
+# With vectorize=True each chunk is scored in one NumPy call by a
+# VectorScorer (vector_scoring.py) instead of item by item.
+#-----------------------------------------------------------
+
+import json
+import multiprocessing
+import sys
+from collections import Counter, deque
+
+from categorizer import WORK_COUNTERS, Categorizer
+
+# Lines handed to a worker at a time in parallel mode
+DEFAULT_CHUNK_SIZE = 2000
+
+# Per-process Categorizer (and VectorScorer) for pool workers, set up by _init_worker
+_worker_categorizer = None
+_worker_scorer = None
+
+
+def read_lines(paths):
+    """Yield (source, line_number, raw_line) from each path; '-' is stdin"""
+    if not paths:
+        paths = ["-"]
+    for path in paths:
+        if path == "-":
+            for line_number, line in enumerate(sys.stdin, 1):
+                yield "<stdin>", line_number, line
+        else:
+            with open(path, "r", encoding="utf-8") as f:
+                for line_number, line in enumerate(f, 1):
+                    yield path, line_number, line
+
+
+def normalize_lines(records):
+    """Strip whitespace and drop blank lines"""
+    for source, line_number, line in records:
+        item = line.strip()
+        if item:
+            yield source, line_number, item
+
+
+def categorize_items(records, categorizer):
+    """Attach the best section to each item"""
+    categorize = categorizer.categorize
+    for source, line_number, item in records:
+        yield {
+            "source": source,
+            "line": line_number,
+            "item": item,
+            "section": categorize(item),
+        }
+
+
+def categorize_chunks(records, scorer, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Attach the best section to each item, scoring a chunk at a time"""
+    for chunk in chunked(records, chunk_size):
+        yield from _vector_results(chunk, scorer)
+
+
+def _vector_results(chunk, scorer):
+    sections = scorer.categorize_many([item for _, _, item in chunk])
+    for (source, line_number, item), section in zip(chunk, sections):
+        yield {
+            "source": source,
+            "line": line_number,
+            "item": item,
+            "section": section,
+        }
+
+
+def emit_jsonl(results, out):
+    """Write each result as one JSON line; return the number written"""
+    count = 0
+    for result in results:
+        out.write(json.dumps(result, ensure_ascii=False))
+        out.write("\n")
+        count += 1
+    return count
+
+
+def chunked(records, size):
+    """Group records into lists of at most size items"""
+    chunk = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _init_worker(sections_file, keywords_file, db, store, profile, fuzzy, vectorize,
+                 count_work, record_stats):
+    """Build the Categorizer once per worker process"""
+    global _worker_categorizer, _worker_scorer
+    _worker_categorizer = Categorizer(sections_file, keywords_file, db=db, store=store,
+                                      profile=profile, fuzzy=fuzzy)
+    if count_work:
+        _worker_categorizer.counters = dict.fromkeys(WORK_COUNTERS, 0)
+    if record_stats:
+        from keyword_stats import KeywordStats
+
+        # Only collects this worker's hits; the caller saves them
+        _worker_categorizer.keyword_stats = KeywordStats(None)
+    if vectorize:
+        from vector_scoring import VectorScorer
+
+        _worker_scorer = VectorScorer(_worker_categorizer)
+
+
+def _categorize_chunk(chunk):
+    """Categorize and encode one chunk
+
+    Returns (count, JSON Lines text, counters, hits): counters are the
+    chunk's work counters and hits its (keyword hits, section hits), each
+    None when not collected.
+    """
+    if _worker_scorer is not None:
+        results = _vector_results(chunk, _worker_scorer)
+    else:
+        results = categorize_items(chunk, _worker_categorizer)
+    lines = [json.dumps(result, ensure_ascii=False) for result in results]
+    counters = _worker_categorizer.counters
+    if counters is not None:
+        _worker_categorizer.counters = dict.fromkeys(WORK_COUNTERS, 0)
+    hits = None
+    stats = _worker_categorizer.keyword_stats
+    if stats is not None:
+        hits = stats.keyword_hits, stats.section_hits
+        stats.keyword_hits, stats.section_hits = Counter(), Counter()
+    return len(lines), "".join(line + "\n" for line in lines), counters, hits
+
+
+def run_parallel(items, categorizer, out, jobs, chunk_size=DEFAULT_CHUNK_SIZE,
+                 vectorize=False):
+    """Categorize items across a process pool, writing results in input order
+
+    Only a bounded window of chunks is in flight at once, so memory stays
+    constant however large the input is.
+    """
+    count = 0
+    max_pending = jobs * 4
+    counters = categorizer.counters
+    stats = categorizer.keyword_stats
+
+    def write(result):
+        nonlocal count
+        written, text, chunk_counters, hits = result
+        out.write(text)
+        count += written
+        if counters is not None:
+            for key, value in chunk_counters.items():
+                counters[key] += value
+        if stats is not None:
+            stats.merge(*hits)
+
+    with multiprocessing.Pool(jobs, initializer=_init_worker,
+                              initargs=(categorizer.sections_file,
+                                        categorizer.keywords_file,
+                                        categorizer.db, categorizer.store,
+                                        categorizer.profile_name,
+                                        categorizer.fuzzy, vectorize,
+                                        counters is not None,
+                                        stats is not None)) as pool:
+        pending = deque()
+        for chunk in chunked(items, chunk_size):
+            pending.append(pool.apply_async(_categorize_chunk, (chunk,)))
+            if len(pending) >= max_pending:
+                write(pending.popleft().get())
+        while pending:
+            write(pending.popleft().get())
+    return count
+
+
+def run_batch(paths, categorizer, out, jobs=1, vectorize=False):
+    """Run the full read -> normalize -> categorize -> emit pipeline
+
+    categorizer is used directly when jobs is 1; pool workers build their
+    own from the same files (normally straight from the keyword index
+    cache the caller's Categorizer has already written).  vectorize
+    scores whole chunks with NumPy (requires numpy).
+    """
+    records = read_lines(paths)
+    items = normalize_lines(records)
+    if jobs > 1:
+        return run_parallel(items, categorizer, out, jobs, vectorize=vectorize)
+    if vectorize:
+        from vector_scoring import VectorScorer
+
+        results = categorize_chunks(items, VectorScorer(categorizer))
+    else:
+        results = categorize_items(items, categorizer)
+    return emit_jsonl(results, out)
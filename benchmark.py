@@ -0,0 +1,214 @@
+#!/usr/bin/python3
+# benchmark.py
+#-----------------------------------------------------------
+# Categorization throughput/latency benchmark for grocery-list.py
+#
+# Generates synthetic keyword sets and shopping lists, then measures
+# for every (keywords, items) combination:
+#   - startup: cold index build and warm load from keywords.index
+#   - throughput (items/sec) and p50/p99 per-item latency
+#   - peak memory of the scenario process
+# Items go through Categorizer.categorize exactly as grocery-list.py
+# runs it: in-memory result cache and fuzzy fallback included.
+# Results are written to a JSON file; pass --compare OLD.json to see
+# the change against an earlier run.
+#
+# Usage:
+#   python3 benchmark.py --quick
+#   python3 benchmark.py --items 1000,100000 --keywords 250,10000 -o bench.json
+#-----------------------------------------------------------
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import random
+import string
+import tempfile
+import time
+from datetime import datetime
+
+from categorizer import Categorizer
+from result_cache import ResultCache
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+DEFAULT_ITEMS = [10, 1000, 100000, 1000000]
+DEFAULT_KEYWORDS = [250, 5000, 100000]
+QUICK_ITEMS = [10, 1000, 10000]
+QUICK_KEYWORDS = [250, 5000]
+SECTION_COUNT = 24
+NOISE_WORDS = ["1", "2", "small", "large", "organic", "pk.", "see", "email", "for", "eva"]
+
+
+def make_word(rng):
+    """Return a random lowercase pseudo-word"""
+    return "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 9)))
+
+
+def generate_keywords(count, seed=0):
+    """Return {section: [keyword, ...]} with count keywords, ~30% phrases"""
+    rng = random.Random(seed)
+    sections = [f"Section {i:02d}" for i in range(SECTION_COUNT)]
+    keywords = {section: [] for section in sections}
+    seen = set()
+    while len(seen) < count:
+        words = [make_word(rng) for _ in range(rng.choice([1, 1, 1, 2, 2, 3]))]
+        keyword = " ".join(words)
+        if keyword in seen:
+            continue
+        seen.add(keyword)
+        keywords[rng.choice(sections)].append(keyword)
+    return sections, keywords
+
+
+def generate_items(count, keywords, seed=1):
+    """Yield count list lines; most contain a known keyword plus noise"""
+    rng = random.Random(seed)
+    pool = [k for keys in keywords.values() for k in keys]
+    for _ in range(count):
+        parts = [rng.choice(NOISE_WORDS) for _ in range(rng.randint(0, 2))]
+        if rng.random() < 0.9:
+            parts.insert(rng.randint(0, len(parts)), rng.choice(pool))
+        else:
+            parts.append(make_word(rng))
+        yield " ".join(parts).title()
+
+
+def percentile(sorted_values, pct):
+    """Return the pct percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def peak_memory_mb():
+    """Return this process's peak resident memory in MB, if available"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    if platform.system() == "Darwin":
+        return round(peak / (1024 * 1024), 1)
+    return round(peak / 1024, 1)
+
+
+def run_scenario(keyword_count, item_count):
+    """Benchmark one combination; runs in a fresh process for clean memory"""
+    sections, keywords = generate_keywords(keyword_count)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        sections_file = os.path.join(tmp, "sections.json")
+        keywords_file = os.path.join(tmp, "keywords.json")
+        with open(sections_file, "w") as f:
+            json.dump(sections, f)
+        with open(keywords_file, "w") as f:
+            json.dump(keywords, f)
+
+        start = time.perf_counter()
+        Categorizer(sections_file, keywords_file)
+        cold_startup = time.perf_counter() - start
+
+        start = time.perf_counter()
+        categorizer = Categorizer(sections_file, keywords_file, result_cache=ResultCache())
+        warm_startup = time.perf_counter() - start
+
+    latencies = []
+    clock = time.perf_counter
+    categorize = categorizer.categorize
+    start = clock()
+    for item in generate_items(item_count, keywords):
+        t0 = clock()
+        categorize(item)
+        latencies.append(clock() - t0)
+    elapsed = clock() - start
+    categorize_time = sum(latencies)
+    latencies.sort()
+
+    return {
+        "keywords": keyword_count,
+        "items": item_count,
+        "cold_startup_s": round(cold_startup, 6),
+        "warm_startup_s": round(warm_startup, 6),
+        "items_per_sec": round(item_count / categorize_time, 1) if categorize_time else None,
+        "p50_latency_us": round(percentile(latencies, 50) * 1e6, 2),
+        "p99_latency_us": round(percentile(latencies, 99) * 1e6, 2),
+        "total_s": round(elapsed, 6),
+        "cache_hit_rate": categorizer.result_cache.stats()["hit_rate"],
+        "peak_memory_mb": peak_memory_mb(),
+    }
+
+
+def _scenario_worker(args):
+    return run_scenario(*args)
+
+
+def compare(results, baseline_file):
+    """Print items/sec and p99 changes against a previous results file"""
+    with open(baseline_file, "r") as f:
+        baseline = json.load(f)
+    old = {(r["keywords"], r["items"]): r for r in baseline["results"]}
+    print(f"\nCompared with {baseline_file} ({baseline.get('label') or baseline['timestamp']}):")
+    for r in results:
+        prev = old.get((r["keywords"], r["items"]))
+        if not prev or not prev["items_per_sec"] or not r["items_per_sec"]:
+            continue
+        speedup = r["items_per_sec"] / prev["items_per_sec"]
+        print(f"  {r['keywords']:>7} kw × {r['items']:>8} items: "
+              f"{speedup:5.2f}x items/sec, p99 {prev['p99_latency_us']}→{r['p99_latency_us']} µs")
+
+
+def parse_sizes(value):
+    return [int(v) for v in value.split(",") if v.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark grocery-list categorization")
+    parser.add_argument("--items", type=parse_sizes, help="comma-separated list sizes")
+    parser.add_argument("--keywords", type=parse_sizes, help="comma-separated keyword set sizes")
+    parser.add_argument("--quick", action="store_true", help="small sizes for a fast check")
+    parser.add_argument("-o", "--output", default="benchmark_results.json",
+                        help="results file (default: benchmark_results.json)")
+    parser.add_argument("--label", default="", help="free-form label stored with the results")
+    parser.add_argument("--compare", metavar="FILE", help="previous results file to compare with")
+    args = parser.parse_args()
+
+    item_sizes = args.items or (QUICK_ITEMS if args.quick else DEFAULT_ITEMS)
+    keyword_sizes = args.keywords or (QUICK_KEYWORDS if args.quick else DEFAULT_KEYWORDS)
+
+    results = []
+    # One fresh process per scenario so peak memory is not inherited
+    ctx = multiprocessing.get_context("spawn")
+    for keyword_count in keyword_sizes:
+        for item_count in item_sizes:
+            with ctx.Pool(1) as pool:
+                result = pool.apply(_scenario_worker, ((keyword_count, item_count),))
+            results.append(result)
+            print(f"{keyword_count:>7} kw × {item_count:>8} items: "
+                  f"{result['items_per_sec']:>10} items/s  "
+                  f"p50 {result['p50_latency_us']:>8} µs  p99 {result['p99_latency_us']:>8} µs  "
+                  f"cold {result['cold_startup_s']:.3f}s  warm {result['warm_startup_s']:.3f}s  "
+                  f"peak {result['peak_memory_mb']} MB")
+
+    report = {
+        "label": args.label,
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=4)
+    print(f"\n✅ Results saved to {args.output}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
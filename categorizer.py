@@ -0,0 +1,274 @@
+# categorizer.py
+#-----------------------------------------------------------
+# Reusable categorization API for the Grocery List Organizer
+#
+# Loads sections.json and the compiled keyword index once and then
+# categorizes any number of items without touching the disk again:
+#
+#     from categorizer import Categorizer
+#     cat = Categorizer()
+#     cat.categorize("2% milk")            -> "Dairy / Refrigerated"
+#     cat.categorize_many(["milk", "bread"])
+#     cat.sort(items)                      -> {section: [items]} in walking order
+#
+# Pass a ResultCache to memoize results; it is bound to a version hash
+# of both config files and invalidated whenever either changes.
+#
+# With db/store set, sections and keywords come from a SqliteStore
+# (sqlite_store.py) instead of the JSON files.  A store profile
+# (store_profiles.py) can be layered on top with profile=... or
+# set_profile(); switching profiles never rebuilds the base matcher.
+# Items without an exact hit fall back to fuzzy matching unless
+# fuzzy=False.  Set counters to a dict (see WORK_COUNTERS) to have the
+# scoring work tallied, as grocery-list.py --metrics does, and
+# keyword_stats to a KeywordStats (keyword_stats.py) to record which
+# keywords hit.
+#-----------------------------------------------------------
+
+import hashlib
+import json
+
+from keyword_index import (INDEX_FORMAT, KeywordIndex, literal_scores, load_keyword_index,
+                           pick_best, read_journal_raw)
+from keyword_journal import COMPACT_THRESHOLD, append_keywords, compact, journal_path_for
+from normalize import normalize, normalize_plain, singularize_text
+from store_profiles import load_profile
+
+UNSORTED_SECTION = "Unsorted / New Items"
+
+# Work tallied in Categorizer.counters when it is set
+WORK_COUNTERS = ("items_scored", "keywords_scanned", "matches", "fuzzy_corrections")
+
+
+class Categorizer:
+    """Assigns list items to store sections using keywords.json"""
+
+    def __init__(self, sections_file="sections.json", keywords_file="keywords.json",
+                 use_cache=True, result_cache=None, db=None, store="default",
+                 profile=None, fuzzy=True):
+        self.sections_file = sections_file
+        self.keywords_file = keywords_file
+        self.use_cache = use_cache
+        self.result_cache = result_cache
+        self.db = db
+        self.store = store
+        self.profile_name = profile
+        self.profile = None
+        self.fuzzy = fuzzy
+        self.counters = None
+        self.keyword_stats = None
+        self.reload()
+
+    def reload(self):
+        """(Re)load sections and the keyword index from disk"""
+        if self.db:
+            raw_sections = self._load_from_db()
+        else:
+            with open(self.sections_file, "rb") as f:
+                raw_sections = f.read()
+            self.base_sections = json.loads(raw_sections)
+            self.index = load_keyword_index(self.keywords_file, use_cache=self.use_cache)
+
+        self.raw_sections = raw_sections
+        self._set_base_version()
+
+    def _set_base_version(self):
+        # Identifies this exact base configuration for the result cache
+        self.base_version = hashlib.sha256(
+            self.raw_sections + self.index.source_hash.encode("ascii")
+            + (b"fuzzy" if self.fuzzy else b"exact")
+            + str(INDEX_FORMAT).encode("ascii")).hexdigest()
+        self.set_profile(self.profile_name)
+
+    def reload_journal(self):
+        """Re-apply the learned-keyword journal without reloading keywords.json"""
+        journal_raw = read_journal_raw(self.keywords_file)
+        if journal_raw:
+            self.index.overlay_journal(journal_raw)
+            self._set_base_version()
+
+    def set_profile(self, name):
+        """Switch to store profile name (None for the base layout)
+
+        Only the profile's own small overlay is loaded; the base keyword
+        index is reused as is.
+        """
+        self.profile_name = name
+        if name:
+            self.profile = load_profile(name, self.base_sections)
+            self.section_names = self.profile.section_names
+            self.version = hashlib.sha256(
+                (self.base_version + self.profile.digest).encode("ascii")).hexdigest()
+        else:
+            self.profile = None
+            self.section_names = self.base_sections
+            self.version = self.base_version
+        # Keywords every scored item is matched against
+        self.keyword_count = sum(len(m.keywords) for m in self.index.matchers)
+        if self.profile is not None and self.profile.matcher is not None:
+            self.keyword_count += len(self.profile.matcher.keywords)
+        if self.result_cache is not None:
+            self.result_cache.set_version(self.version)
+
+    def _load_from_db(self):
+        """Load only the selected store's rows; return sections as bytes"""
+        from sqlite_store import SqliteStore
+
+        store = SqliteStore(self.db)
+        try:
+            self.base_sections = store.load_sections(self.store)
+            keywords = store.load_keywords(self.store)
+            revision = store.revision(self.store)
+        finally:
+            store.close()
+        source_hash = hashlib.sha256(
+            f"sqlite:{self.db}:{self.store}:{revision}".encode("utf-8")).hexdigest()
+        self.index = KeywordIndex(keywords, source_hash=source_hash)
+        return json.dumps(self.base_sections).encode("utf-8")
+
+    @property
+    def keywords(self):
+        """The {section: [keyword, ...]} mapping the index was built from"""
+        return self.index.keywords
+
+    def scores(self, item):
+        """Return {section: score} for item under the active layout"""
+        return self._scores(normalize(item))
+
+    def _scores(self, text):
+        if self.keyword_stats is None:
+            scores = self.index.score(text)
+        else:
+            scores = {}
+            for matcher in self.index.matchers:
+                found = matcher.find(text)
+                self.keyword_stats.record(matcher, found)
+                for section, score in matcher.section_scores(found, text).items():
+                    scores[section] = scores.get(section, 0) + score
+        if self.profile is not None:
+            scores = self.profile.score(scores, text)
+        counters = self.counters
+        if counters is not None:
+            counters["items_scored"] += 1
+            counters["keywords_scanned"] += self.keyword_count
+            counters["matches"] += sum(scores.values())
+        return scores
+
+    def _literal_scores(self, text, plain):
+        """Return {section: hits in text that plain contains as written}"""
+        profile = self.profile
+        rename = profile.rename if profile is not None else {}
+        hits = [(section, matcher.keywords[kid]) for matcher in self.index.matchers
+                for kid in matcher.find(text) for section in matcher.sections[kid]]
+        scores = literal_scores(hits, plain, self.index.plain_forms, rename)
+        if profile is not None and profile.matcher is not None:
+            matcher = profile.matcher
+            hits = [(section, matcher.keywords[kid]) for kid in matcher.find(text)
+                    for section in matcher.sections[kid]]
+            for section, score in literal_scores(hits, plain, profile.plain_forms).items():
+                scores[section] = scores.get(section, 0) + score
+        return scores
+
+    def _best_section(self, text, plain):
+        # Ties go to the section whose keywords the item contains as
+        # written, then to walking order (keyword_index.pick_best)
+        best = pick_best(self._scores(text), self.section_names,
+                         lambda: self._literal_scores(text, plain))
+        if best is None and self.fuzzy:
+            # No exact hit: correct unknown words to the closest keyword
+            # word within a small edit distance ("cherrio" -> "cheerio")
+            # and try the exact matcher again
+            corrected = self.index.fuzzy.correct(text)
+            if corrected is not None:
+                if self.counters is not None:
+                    self.counters["fuzzy_corrections"] += 1
+                best = pick_best(self._scores(corrected), self.section_names,
+                                 lambda: self._literal_scores(corrected, plain))
+        return best or UNSORTED_SECTION
+
+    def categorize(self, item):
+        """Return the section for item, or UNSORTED_SECTION if nothing matches"""
+        # Scoring only sees the plain text (and its singular form, which
+        # follows from it), so that is the cache key
+        plain = normalize_plain(item)
+        cache = self.result_cache
+        if cache is None:
+            return self._best_section(singularize_text(plain), plain)
+
+        section = cache.get(plain)
+        if section is None:
+            section = self._best_section(singularize_text(plain), plain)
+            cache.put(plain, section)
+        return section
+
+    def categorize_many(self, items):
+        """Return the section for each item, in order"""
+        categorize = self.categorize
+        return [categorize(item) for item in items]
+
+    def sort(self, items):
+        """Group items into {section: [items]} in walking order
+
+        Every section from sections.json is present (possibly empty);
+        UNSORTED_SECTION is appended at the end only when needed.
+        """
+        sections = {section: [] for section in self.section_names}
+        for item, section in zip(items, self.categorize_many(items)):
+            sections.setdefault(section, []).append(item)
+        return sections
+
+    @property
+    def journal_file(self):
+        return journal_path_for(self.keywords_file)
+
+    def add_keywords(self, new_keywords, refresh=True):
+        """Learn {section: [keyword, ...]} via the journal
+
+        Only the small journal overlay is rebuilt to pick them up; the
+        compiled keywords.json index is reused.  The journal is folded
+        back into keywords.json once it grows past COMPACT_THRESHOLD
+        entries.  With a database the keywords are inserted directly,
+        and with a store profile they are added to the profile's
+        overlay.  Pass refresh=False when this Categorizer will not
+        categorize anything else, to skip updating it at all.
+        """
+        if self.profile is not None:
+            self.profile.add_keywords(new_keywords)
+            if refresh:
+                self.set_profile(self.profile_name)
+            return
+
+        if self.db:
+            from sqlite_store import SqliteStore
+
+            store = SqliteStore(self.db)
+            try:
+                store.add_keywords(self.store, new_keywords)
+            finally:
+                store.close()
+            if refresh:
+                self.reload()
+            return
+
+        append_keywords(self.journal_file, new_keywords)
+        if self.keyword_stats is not None:
+            self.keyword_stats.mark_learned(new_keywords)
+        if self.journal_size() >= COMPACT_THRESHOLD:
+            self.compact_journal()
+            if refresh:
+                # keywords.json changed: rebuilt once per COMPACT_THRESHOLD learned keywords
+                self.reload()
+        elif refresh:
+            self.reload_journal()
+
+    def journal_size(self):
+        """Number of learned keywords not yet folded into keywords.json"""
+        try:
+            with open(self.journal_file, "rb") as f:
+                return sum(1 for _ in f)
+        except FileNotFoundError:
+            return 0
+
+    def compact_journal(self):
+        """Fold the journal into keywords.json; return entries folded"""
+        return compact(self.keywords_file, self.journal_file)
@@ -0,0 +1,123 @@
+# clipboard_watch.py
+#-----------------------------------------------------------
+# Clipboard watch mode for grocery-list.py --watch
+#
+# An asyncio loop polls the clipboard (pyperclip, run in a worker
+# thread so a slow backend never blocks the loop) and, once a newly
+# copied list has stopped changing for the debounce delay, sorts it
+# and puts the sorted list back on the clipboard:
+#
+#     copy list -> (debounce) -> sort -> paste sorted list anywhere
+#
+# The Categorizer stays loaded between updates and an in-memory
+# IncrementalSorter reuses the section of every line from the previous
+# sort, so re-sorting an edited list only categorizes the new lines.
+# Polling backs off while the clipboard is idle, so the loop sleeps
+# almost all the time.  The watcher's own output is recognized and not
+# re-sorted; copying an edited version of it is (section headers and
+# bullets are stripped first).
+#-----------------------------------------------------------
+
+import asyncio
+import time
+
+from categorizer import UNSORTED_SECTION
+from incremental_sort import IncrementalSorter
+
+# Clipboard text with fewer list lines than this is left alone
+MIN_LINES = 2
+
+# Bullet prefixes written by the clipboard and checklist formats
+BULLETS = ("• [ ] ", "- [ ] ", "• ")
+
+
+def parse_list(text, section_names):
+    """Return the items in clipboard text, dropping our headers and bullets"""
+    headers = {f"{section}:" for section in section_names}
+    headers.add(f"{UNSORTED_SECTION}:")
+    items = []
+    for line in text.splitlines():
+        line = line.strip()
+        if not line or line in headers:
+            continue
+        for bullet in BULLETS:
+            if line.startswith(bullet):
+                line = line[len(bullet):].strip()
+                break
+        if line:
+            items.append(line)
+    return items
+
+
+def format_list(sections):
+    """Return {section: [items]} as plain text for pasting"""
+    parts = []
+    for section, items in sections.items():
+        if items:
+            parts.append(f"{section}:\n")
+            parts.extend(f"• {i}\n" for i in items)
+            parts.append("\n")
+    return "".join(parts).rstrip("\n") + "\n"
+
+
+class ClipboardWatcher:
+    """Debounced clipboard -> sort -> clipboard loop"""
+
+    def __init__(self, categorizer, paste, copy, interval=0.25, max_interval=2.0,
+                 debounce=0.75, on_sorted=None):
+        self.categorizer = categorizer
+        self.sorter = IncrementalSorter(categorizer)
+        self.paste = paste
+        self.copy = copy
+        self.interval = interval
+        self.max_interval = max_interval
+        self.debounce = debounce
+        # Called with (items, sections) after every sort
+        self.on_sorted = on_sorted
+        self.last_written = None
+        self.sorts = 0
+
+    def sort_text(self, text):
+        """Sort clipboard text; return (items, sections) or None if not a list"""
+        items = parse_list(text, self.categorizer.section_names)
+        if len(items) < MIN_LINES:
+            return None
+        return items, self.sorter.sort(items)
+
+    async def run(self):
+        """Watch until cancelled"""
+        # Whatever is on the clipboard at start is not ours to replace
+        seen = await asyncio.to_thread(self.paste)
+        changed_at = None
+        interval = self.interval
+
+        while True:
+            await asyncio.sleep(interval)
+            text = await asyncio.to_thread(self.paste)
+
+            if text != seen:
+                seen = text
+                # Our own output coming back is not a new list
+                changed_at = None if text == self.last_written else time.monotonic()
+                interval = self.interval
+                continue
+
+            if changed_at is None:
+                # Idle: poll less often
+                interval = min(self.max_interval, interval * 1.5)
+                continue
+
+            if time.monotonic() - changed_at < self.debounce:
+                continue
+
+            changed_at = None
+            result = self.sort_text(text)
+            if result is None:
+                continue
+            items, sections = result
+            output = format_list(sections)
+            self.last_written = seen = output
+            await asyncio.to_thread(self.copy, output)
+            self.sorts += 1
+            if self.on_sorted is not None:
+                self.on_sorted(items, sections)
@@ -0,0 +1,144 @@
+# fuzzy_index.py
+#-----------------------------------------------------------
+# Trigram index for misspelled items ("Cherrios" -> "cheerios")
+#
+# Used only when an item has no exact keyword hit.  Every word that
+# appears in a normalized keyword is indexed by (length, trigram);
+# item words missing from that vocabulary are corrected to the
+# closest vocabulary word within a small edit distance, and the
+# corrected text goes through the exact matcher again.  A lookup only
+# touches words of about the right length that share trigrams with
+# the query, and candidates sharing too few trigrams to be within the
+# distance limit are skipped before the (bounded) Levenshtein check.
+# The index is built with, and cached alongside, the keyword index;
+# learned keywords from the journal are added to it on load.
+#-----------------------------------------------------------
+
+# Words shorter than this are too ambiguous to correct
+MIN_FUZZY_LENGTH = 4
+
+
+def max_distance(length):
+    """Edit distance allowed for a word of the given length"""
+    return 1 if length <= 8 else 2
+
+
+def trigrams(text):
+    """Return the set of trigrams of text padded with one space each side"""
+    padded = f" {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def within_one_edit(a, b):
+    """Return True if a and b differ by at most one insert/delete/substitute"""
+    if len(a) > len(b):
+        a, b = b, a
+    if len(b) - len(a) > 1:
+        return False
+    i = 0
+    while i < len(a) and a[i] == b[i]:
+        i += 1
+    if len(a) == len(b):
+        return a[i + 1:] == b[i + 1:]
+    return a[i:] == b[i + 1:]
+
+
+def bounded_levenshtein(a, b, limit):
+    """Return the edit distance between a and b, or limit + 1 if larger"""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    if limit <= 1:
+        if a == b:
+            return 0
+        return 1 if limit == 1 and within_one_edit(a, b) else limit + 1
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        row_min = i
+        for j, cb in enumerate(b, 1):
+            cost = min(previous[j] + 1, current[j - 1] + 1,
+                       previous[j - 1] + (ca != cb))
+            current.append(cost)
+            if cost < row_min:
+                row_min = cost
+        if row_min > limit:
+            return limit + 1
+        previous = current
+    return min(previous[-1], limit + 1)
+
+
+class FuzzyIndex:
+    """(length, trigram) -> word postings over the keyword vocabulary"""
+
+    def __init__(self, keywords):
+        # keywords: {section: [normalized keyword, ...]}
+        self.words = sorted({word for keys in keywords.values()
+                             for k in keys for word in k.split()})
+        self.vocabulary = set(self.words)
+        self.postings = {}      # (length, trigram) -> [word id, ...]
+        for wid, word in enumerate(self.words):
+            if len(word) >= MIN_FUZZY_LENGTH - 1:
+                for gram in trigrams(word):
+                    self.postings.setdefault((len(word), gram), []).append(wid)
+
+    def add_words(self, keywords):
+        """Add the words of {section: [normalized keyword, ...]} not yet indexed"""
+        for keys in keywords.values():
+            for k in keys:
+                for word in k.split():
+                    if word in self.vocabulary:
+                        continue
+                    wid = len(self.words)
+                    self.words.append(word)
+                    self.vocabulary.add(word)
+                    if len(word) >= MIN_FUZZY_LENGTH - 1:
+                        for gram in trigrams(word):
+                            self.postings.setdefault((len(word), gram), []).append(wid)
+
+    def closest(self, word):
+        """Return the closest vocabulary word within the limit, or None"""
+        length = len(word)
+        limit = max_distance(length)
+        grams = trigrams(word)
+        best = None
+        best_distance = limit + 1
+        # Same length first: substitutions are the most common typo
+        lengths = sorted(range(length - limit, length + limit + 1),
+                         key=lambda n: abs(n - length))
+        for candidate_length in lengths:
+            if abs(candidate_length - length) >= best_distance:
+                break
+            counts = {}
+            for gram in grams:
+                for wid in self.postings.get((candidate_length, gram), ()):
+                    counts[wid] = counts.get(wid, 0) + 1
+            # Most shared trigrams first, so a close match tightens the bound early
+            for wid, shared in sorted(counts.items(), key=lambda c: -c[1]):
+                # Each edit destroys at most 3 of the padded trigrams
+                if shared < min(len(grams), candidate_length + 2) - 3 * (best_distance - 1):
+                    break
+                candidate = self.words[wid]
+                distance = bounded_levenshtein(word, candidate, best_distance - 1)
+                if distance < best_distance:
+                    best, best_distance = candidate, distance
+                    if distance <= 1:
+                        # word is not in the vocabulary, so one edit is the best possible
+                        return best
+        return best
+
+    def correct(self, text):
+        """Return text with unknown words replaced by their closest match
+
+        text must already be normalized.  Returns None when no word was
+        corrected.
+        """
+        words = text.split()
+        changed = False
+        for i, word in enumerate(words):
+            if len(word) < MIN_FUZZY_LENGTH or word in self.vocabulary:
+                continue
+            replacement = self.closest(word)
+            if replacement is not None:
+                words[i] = replacement
+                changed = True
+        return " ".join(words) if changed else None
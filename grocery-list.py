@@ -1,12 +1,51 @@
 #!/usr/bin/python3
 # grocery-list.py
-# Version: 2.1.4
-# Last Updated: 2025-11-06T05:49:55-06:00
+# Version: 2.6.2
+# Last Updated: 2026-10-17T18:00:00-06:00
 #-----------------------------------------------------------
 # Grocery list organizer and sorter by store sections
 # Takes shopping list from clipboard and sorts by walking order
 #
 # Changelog:
+# v2.6.2 (2026-10-17) - --incremental re-sorts only lines added or changed
+#                       since the last run (incremental_sort.py)
+# v2.6.1 (2026-10-17) - --watch: asyncio clipboard watcher that re-sorts copied
+#                       lists in place (clipboard_watch.py)
+# v2.6.0 (2026-10-17) - --defer queues unsorted items (review_queue.py) instead
+#                       of prompting; --review works through the queue
+# v2.5.3 (2026-10-17) - Single-pass output rendering (list_renderer.py);
+#                       --format adds Markdown, JSON and HTML checklists
+# v2.5.2 (2026-10-17) - --keyword-stats records keyword hit counts across runs
+#                       in keywords.stats; pruned with keyword_stats.py
+# v2.5.1 (2026-10-17) - --metrics JSON report with per-phase wall/CPU time and
+#                       work counters; --metrics-profile adds cProfile output
+# v2.5.0 (2026-10-17) - --compare-stores sorts one list for every store
+#                       profile in a single pass (multi_store.py)
+# v2.4.3 (2026-10-17) - --vectorize scores --batch chunks with NumPy
+#                       (vector_scoring.py); numpy is optional
+# v2.4.2 (2026-10-17) - Fuzzy fallback for misspelled items (fuzzy_index.py),
+#                       disabled with --no-fuzzy
+# v2.4.1 (2026-10-17) - Normalize keywords and items (normalize.py): casefold,
+#                       punctuation, noise phrases, plural -> singular
+# v2.4.0 (2026-10-17) - Store profiles (stores/<name>.json) layered over the
+#                       shared keyword index, selected with --store
+# v2.3.4 (2026-10-17) - Optional SQLite storage backend (--db/--store,
+#                       sqlite_store.py) with JSON import/export
+# v2.3.3 (2026-10-17) - Learned keywords go to an append-only journal
+#                       (keywords.journal), compacted with --compact-journal
+# v2.3.2 (2026-10-17) - Memoize item->section results in an LRU cache with
+#                       optional on-disk tier (--result-cache, --cache-stats)
+# v2.3.1 (2026-10-17) - Lazy-load pyperclip, argparse, datetime and batch
+#                       modules; added --startup-profile timing breakdown
+# v2.3.0 (2026-10-17) - Moved categorization into an importable Categorizer
+#                       class (categorizer.py); script is now a thin CLI
+# v2.2.3 (2026-10-17) - Added --jobs for multi-process batch categorization
+# v2.2.2 (2026-10-17) - Added --batch mode streaming list files/stdin to
+#                       JSON Lines (batch_categorize.py)
+# v2.2.1 (2026-10-17) - Cache the compiled keyword index in keywords.index,
+#                       rebuilt only when keywords.json changes
+# v2.2.0 (2026-10-17) - Replaced per-keyword regex loop with a single-pass
+#                       Aho-Corasick matcher (keyword_matcher.py)
 # v2.1.3 (2025-11-05) - Added section_editor.py GUI utility for managing
 #                       sections.json with drag-and-drop reordering
 # v2.1.1 (2025-11-05) - Added interactive categorization for unsorted items
@@ -16,171 +55,587 @@
 # v1.0.0 (2024-10-07) - Initial version w hardcoded sections & keywords
 #-----------------------------------------------------------
 
-import pyperclip
-import json
-import re
-from datetime import datetime
+import sys
+import time
+
+# --startup-profile measures everything from this point on
+SCRIPT_START = time.perf_counter()
+
+profiler = None
+if "--startup-profile" in sys.argv:
+    from startup_profile import StartupProfiler
+    profiler = StartupProfiler(SCRIPT_START)
+    profiler.install_import_hook()
+
+# Heavy or optional modules (pyperclip, argparse, datetime, batch mode)
+# are imported where they are used so the common path stays fast
+import os
+from types import SimpleNamespace
+
+from categorizer import Categorizer, UNSORTED_SECTION, WORK_COUNTERS
+from result_cache import ResultCache
+from store_profiles import list_profiles, profile_path
 
 # Version information
-VERSION = "2.1.4"
-LAST_UPDATED = "2025-11-06T05:49:55-06:00"
+VERSION = "2.6.2"
+LAST_UPDATED = "2026-10-17T18:00:00-06:00"
+
+# Argument defaults, shared by argparse and the no-argument fast path
+DEFAULT_ARGS = {
+    "batch": None,
+    "output": None,
+    "jobs": 1,
+    "vectorize": False,
+    "startup_profile": False,
+    "result_cache": None,
+    "incremental": None,
+    "cache_stats": False,
+    "compact_journal": False,
+    "db": None,
+    "store": None,
+    "no_fuzzy": False,
+    "compare_stores": None,
+    "metrics": None,
+    "metrics_profile": None,
+    "keyword_stats": False,
+    "formats": None,
+    "defer": False,
+    "review": False,
+    "watch": False,
+    "debounce": 0.75,
+}
+
+# Used when the clipboard is empty
+DEMO_LIST = [
+    "bananas",
+    "golden delicious apple",
+    "bartlett pears",
+    "egg salad",
+    "1 Dole salad",
+    "off the bone turkey",
+    "Tuna salad",
+    "Cole slaw",
+    "mini blueberry muffins",
+    "Wheaties",
+    "Small Oscar Mayer Beef Bologna",
+    "Free price Chopper water -24 pk. - see email",
+    "cinnamon honey apple sauce for Eva",
+    "grilled cheese crackers",
+    "1 low sodium Lay's chips",
+    "nutra grain breakfast bars",
+    "Friday Freebie - Tropicana Orange Juice - see email",
+    "egg bites asiato mushroom",
+    "milk",
+    "Cherrios",
+    "Coke",
+    "Lemonade",
+    "Cranberry Juice",
+    "Cottage Cheese",
+    "Chocolate Milk"
+]
+
+
+# RunMetrics collecting the --metrics report, set up in main()
+metrics = None
+
+
+class _NullPhase:
+    """Stand-in for profiler phases when --startup-profile is off"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_PHASE = _NullPhase()
+
+
+def phase(name):
+    """Time a phase of the run when --startup-profile or --metrics is on"""
+    inner = profiler.phase(name) if profiler else None
+    if metrics is not None:
+        return metrics.phase(name, inner)
+    return inner or _NULL_PHASE
+
+
+def parse_args(argv):
+    if not argv:
+        # Plain launcher run: skip importing argparse entirely
+        return SimpleNamespace(**DEFAULT_ARGS)
+
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Sort a grocery list into store walking order")
+    parser.add_argument("--format", dest="formats", action="append", metavar="FORMAT",
+                        choices=["checklist", "markdown", "json", "html"],
+                        help="checklist file format: checklist (shopping_checklist.txt), "
+                             "markdown, json or html; repeat for several (default: checklist)")
+    parser.add_argument("--defer", action="store_true",
+                        help="don't prompt for unsorted items; write the checklist right away "
+                             "and queue them for --review")
+    parser.add_argument("--review", action="store_true",
+                        help="sort the items queued by --defer and learn their keywords")
+    parser.add_argument("--watch", action="store_true",
+                        help="keep running and replace every list copied to the clipboard "
+                             "with its sorted version (Ctrl+C to stop)")
+    parser.add_argument("--debounce", type=float, metavar="SECONDS",
+                        help="with --watch, wait until the clipboard has been stable this "
+                             "long before sorting (default: 0.75)")
+    parser.add_argument("--batch", nargs="*", metavar="FILE",
+                        help="categorize list files non-interactively and stream JSON Lines "
+                             "(reads stdin when no FILE or '-' is given)")
+    parser.add_argument("-o", "--output", metavar="FILE",
+                        help="write --batch results (or the --compare-stores report "
+                             "as JSON) to FILE")
+    parser.add_argument("-j", "--jobs", type=int, default=1, metavar="N",
+                        help="number of worker processes for --batch (0 = all cores)")
+    parser.add_argument("--vectorize", action="store_true",
+                        help="score --batch items a chunk at a time with NumPy")
+    parser.add_argument("--startup-profile", action="store_true",
+                        help="print per-import and per-phase timings to stderr")
+    parser.add_argument("--metrics", nargs="?", const="metrics.json", metavar="FILE",
+                        help="write per-phase wall/CPU time and work counters as JSON "
+                             "(default FILE: metrics.json)")
+    parser.add_argument("--metrics-profile", metavar="FILE",
+                        help="with --metrics, also run categorization under cProfile "
+                             "and dump the stats to FILE")
+    parser.add_argument("--keyword-stats", action="store_true",
+                        help="add this run's keyword hit counts to keywords.stats "
+                             "(see keyword_stats.py; bypasses the on-disk result cache "
+                             "and --incremental)")
+    parser.add_argument("--result-cache", nargs="?", const="results.cache", metavar="FILE",
+                        help="persist categorization results between runs "
+                             "(default FILE: results.cache)")
+    parser.add_argument("--incremental", nargs="?", const="last_sort.json", metavar="FILE",
+                        help="remember each line's section and only categorize lines "
+                             "added or changed since the last run (default FILE: last_sort.json)")
+    parser.add_argument("--cache-stats", action="store_true",
+                        help="print result cache hit/miss counters at the end")
+    parser.add_argument("--compact-journal", action="store_true",
+                        help="fold learned keywords from keywords.journal into keywords.json and exit")
+    parser.add_argument("--db", metavar="FILE",
+                        help="load sections and keywords from a SQLite store "
+                             "(see sqlite_store.py) instead of the JSON files")
+    parser.add_argument("--store", metavar="NAME",
+                        help="store profile from stores/NAME.json, or with --db "
+                             "the store to load from the database (default: default)")
+    parser.add_argument("--no-fuzzy", action="store_true",
+                        help="only use exact keyword matches (no typo correction)")
+    parser.add_argument("--compare-stores", nargs="*", metavar="NAME",
+                        help="sort the list for the base layout and each store profile "
+                             "(default: all in stores/) and rank them by coverage")
+    parser.set_defaults(**DEFAULT_ARGS)
+    return parser.parse_args(argv)
+
+
+def run_batch_mode(args, categorizer):
+    """Batch mode: no clipboard, no prompts, results streamed as JSON Lines
+
+    Returns the number of items written.
+    """
+    from batch_categorize import run_batch
+
+    if args.vectorize:
+        try:
+            import numpy
+        except ImportError:
+            print("⚠️ --vectorize needs numpy (pip install numpy)", file=sys.stderr)
+            sys.exit(1)
+
+    jobs = args.jobs if args.jobs > 0 else os.cpu_count() or 1
+    out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        return run_batch(args.batch, categorizer, out, jobs=jobs, vectorize=args.vectorize)
+    except FileNotFoundError as e:
+        # Only the list files are opened while streaming
+        print(f"⚠️ No such list file: {e.filename}", file=sys.stderr)
+        sys.exit(1)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
 
-print(f"Grocery List Organizer v{VERSION} (Updated: {LAST_UPDATED})\n")
+def read_shopping_list():
+    """Try to pull list from clipboard, falling back to the demo list"""
+    # pyperclip probes for clipboard backends, so only load it when needed
+    import pyperclip
 
-# Try to pull list from clipboard
-raw_clipboard = pyperclip.paste().strip()
+    raw_clipboard = pyperclip.paste().strip()
+
+    if raw_clipboard:
+        print("📋 Using shopping list from clipboard...\n")
+        # Split on newlines to get items
+        return [line.strip() for line in raw_clipboard.splitlines() if line.strip()]
 
-if raw_clipboard:
-    print("📋 Using shopping list from clipboard...\n")
-    # Split on newlines to get items
-    shopping_list = [line.strip() for line in raw_clipboard.splitlines() if line.strip()]
-else:
     print("⚠️ Clipboard empty — using fallback demo list...\n")
-    shopping_list = [
-        "bananas",
-        "golden delicious apple",
-        "bartlett pears",
-        "egg salad",
-        "1 Dole salad",
-        "off the bone turkey",
-        "Tuna salad",
-        "Cole slaw",
-        "mini blueberry muffins",
-        "Wheaties",
-        "Small Oscar Mayer Beef Bologna",
-        "Free price Chopper water -24 pk. - see email",
-        "cinnamon honey apple sauce for Eva",
-        "grilled cheese crackers",
-        "1 low sodium Lay's chips",
-        "nutra grain breakfast bars",
-        "Friday Freebie - Tropicana Orange Juice - see email",
-        "egg bites asiato mushroom",
-        "milk",
-        "Cherrios",
-        "Coke",
-        "Lemonade",
-        "Cranberry Juice",
-        "Cottage Cheese",
-        "Chocolate Milk"
-    ]
-
-# Load sections from JSON file
-with open("sections.json", "r") as f:
-    section_names = json.load(f)
-
-# Load keywords from JSON file
-with open("keywords.json", "r") as f:
-    keywords = json.load(f)
-
-# Initialize sections dictionary with empty lists
-sections = {section: [] for section in section_names}
-
-# Categorization logic
-for item in shopping_list:
-    lower_item = item.lower()
-    scores = {section: 0 for section in sections}
-
-    for section, keys in keywords.items():
-        for k in keys:
-            # Use word boundary matching to avoid substring matches
-            # e.g., "corn" won't match "popcorn" or "pop corn"
-            if re.search(r'\b' + re.escape(k) + r'\b', lower_item):
-                scores[section] += 1
-
-    best_section = max(scores, key=scores.get)
-
-    if scores[best_section] == 0:
-        if "Unsorted / New Items" not in sections:
-            sections["Unsorted / New Items"] = []
-        best_section = "Unsorted / New Items"
-
-    sections[best_section].append(item)
-
-# Handle unsorted items interactively
-if "Unsorted / New Items" in sections and sections["Unsorted / New Items"]:
-    print("\n🤔 Found unsorted items! Let's categorize them...\n")
-    
-    # Show available sections
+    return list(DEMO_LIST)
+
+
+def show_sections(section_names):
+    """List the section choices for the prompts"""
     print("Available sections:")
     for i, section in enumerate(section_names, 1):
         print(f"  {i}. {section}")
     print(f"  {len(section_names) + 1}. Skip (keep unsorted)")
     print()
-    
-    unsorted_items = sections["Unsorted / New Items"].copy()
-    sections["Unsorted / New Items"] = []
+
+
+def prompt_for_section(item, section_names):
+    """Ask where item goes; return (section, keyword to learn)
+
+    section is None when the item is skipped, keyword None when it
+    should not be learned.
+    """
+    print(f"📦 Item: '{item}'")
+    while True:
+        try:
+            choice = input(f"Choose section (1-{len(section_names) + 1}): ").strip()
+            if choice == str(len(section_names) + 1):
+                # Skip - keep unsorted
+                return None, None
+            elif 1 <= int(choice) <= len(section_names):
+                selected_section = section_names[int(choice) - 1]
+                keyword = None
+
+                # Ask if user wants to add this as a keyword
+                add_keyword = input(f"Add '{item}' as keyword? (Y/n): ").strip().lower()
+                if add_keyword == 'y' or add_keyword == 'yes' or add_keyword == '':
+                    # Extract main word(s) from item - take first significant word
+                    keyword = item.lower().strip()
+                    print(f"✅ Added '{keyword}' to {selected_section} keywords")
+                return selected_section, keyword
+            else:
+                print(f"Please enter a number between 1 and {len(section_names) + 1}")
+        except ValueError:
+            print(f"Please enter a valid number between 1 and {len(section_names) + 1}")
+
+
+def learn_keywords(categorizer, new_keywords):
+    """Record new keywords in the learning journal"""
+    if new_keywords:
+        # Learning comes last, so the categorizer needn't pick them up
+        categorizer.add_keywords(new_keywords, refresh=False)
+        print(f"📝 Learned {sum(len(keys) for keys in new_keywords.values())} new keywords")
+
+
+def categorize_unsorted(sections, categorizer):
+    """Handle unsorted items interactively, learning new keywords"""
+    section_names = categorizer.section_names
+    print("\n🤔 Found unsorted items! Let's categorize them...\n")
+
+    # Show available sections
+    show_sections(section_names)
+
+    unsorted_items = sections[UNSORTED_SECTION].copy()
+    sections[UNSORTED_SECTION] = []
     new_keywords = {}
-    
+
     for item in unsorted_items:
-        print(f"📦 Item: '{item}'")
-        while True:
-            try:
-                choice = input(f"Choose section (1-{len(section_names) + 1}): ").strip()
-                if choice == str(len(section_names) + 1):
-                    # Skip - keep unsorted
-                    sections["Unsorted / New Items"].append(item)
-                    break
-                elif 1 <= int(choice) <= len(section_names):
-                    selected_section = section_names[int(choice) - 1]
-                    sections[selected_section].append(item)
-                    
-                    # Ask if user wants to add this as a keyword
-                    add_keyword = input(f"Add '{item}' as keyword? (Y/n): ").strip().lower()
-                    if add_keyword == 'y' or add_keyword == 'yes' or add_keyword == '':
-                        # Extract main word(s) from item - take first significant word
-                        keyword = item.lower().strip()
-                        if selected_section not in new_keywords:
-                            new_keywords[selected_section] = []
-                        new_keywords[selected_section].append(keyword)
-                        print(f"✅ Added '{keyword}' to {selected_section} keywords")
-                    break
-                else:
-                    print(f"Please enter a number between 1 and {len(section_names) + 1}")
-            except ValueError:
-                print(f"Please enter a valid number between 1 and {len(section_names) + 1}")
+        selected_section, keyword = prompt_for_section(item, section_names)
+        if selected_section is None:
+            sections[UNSORTED_SECTION].append(item)
+        else:
+            sections[selected_section].append(item)
+            if keyword:
+                new_keywords.setdefault(selected_section, []).append(keyword)
         print()
-    
-    # Update keywords.json if new keywords were added
-    if new_keywords:
-        for section, new_keys in new_keywords.items():
-            if section in keywords:
-                keywords[section].extend(new_keys)
-            else:
-                keywords[section] = new_keys
-        
-        with open("keywords.json", "w") as f:
-            json.dump(keywords, f, indent=4)
-        print(f"📝 Updated keywords.json with {sum(len(keys) for keys in new_keywords.values())} new keywords")
-    
+
+    learn_keywords(categorizer, new_keywords)
+
     # Clean up empty unsorted section
-    if not sections["Unsorted / New Items"]:
-        del sections["Unsorted / New Items"]
-
-# Print neatly to console
-generated_time = datetime.now()
-formatted_time = generated_time.strftime("%A, %B %d, %Y at %I:%M %p")
-
-print(f"\n=== Grocery List (Walking Order) === v{VERSION}\nGenerated: {formatted_time}\n")
-for section, items in sections.items():
-    if items:
-        print(f"{section}:")
-        for i in items:
-            print(f"  • {i}")
-        print()
+    if not sections[UNSORTED_SECTION]:
+        del sections[UNSORTED_SECTION]
+
+
+def defer_unsorted(sections, store):
+    """Queue unsorted items for later review instead of prompting"""
+    from review_queue import QUEUE_FILE, enqueue
+
+    items = sections[UNSORTED_SECTION]
+    added = enqueue(items, store=store)
+    print(f"📥 {len(items)} unsorted items left in '{UNSORTED_SECTION}' "
+          f"({added} newly queued in {QUEUE_FILE}; sort them later with --review)\n")
+
+
+def review_queue(args, categorizer):
+    """Work through the review queue in one sitting
+
+    Items the current keywords already sort are dropped from the queue;
+    the rest are prompted for, and skipped ones stay queued.  Only
+    entries of the active store profile are reviewed.
+    """
+    from review_queue import QUEUE_FILE, read_queue, write_queue
+
+    entries = read_queue()
+    mine = [entry for entry in entries if entry.get("store") == args.store]
+    others = [entry for entry in entries if entry.get("store") != args.store]
+    if not mine:
+        print(f"📭 Nothing to review in {QUEUE_FILE}")
+        return
+
+    pending = []
+    for entry in mine:
+        section = categorizer.categorize(entry["item"])
+        if section == UNSORTED_SECTION:
+            pending.append(entry)
+        else:
+            print(f"✔️ '{entry['item']}' is now sorted into {section}")
+
+    remaining = []
+    new_keywords = {}
+    if pending:
+        print(f"\n🗂️ {len(pending)} queued items to review\n")
+        show_sections(categorizer.section_names)
+        for i, entry in enumerate(pending):
+            try:
+                section, keyword = prompt_for_section(entry["item"], categorizer.section_names)
+            except (KeyboardInterrupt, EOFError):
+                # Keep everything not yet answered for next time
+                print()
+                remaining.extend(pending[i:])
+                break
+            if section is None:
+                remaining.append(entry)
+            elif keyword:
+                new_keywords.setdefault(section, []).append(keyword)
+            print()
+
+    learn_keywords(categorizer, new_keywords)
+    write_queue(others + remaining)
+    print(f"📥 {len(remaining)} items left in the review queue")
+
+
+def watch_clipboard(args, categorizer):
+    """--watch: sort every list copied to the clipboard until interrupted"""
+    import asyncio
+
+    import pyperclip
+
+    from clipboard_watch import ClipboardWatcher
+
+    def on_sorted(items, sections):
+        unsorted = sections.get(UNSORTED_SECTION, [])
+        print(f"🔄 Sorted {len(items)} items into "
+              f"{sum(1 for s, placed in sections.items() if placed and s != UNSORTED_SECTION)}"
+              f" sections — paste away!")
+        if unsorted:
+            defer_unsorted(sections, args.store)
+
+    watcher = ClipboardWatcher(categorizer, pyperclip.paste, pyperclip.copy,
+                               debounce=args.debounce, on_sorted=on_sorted)
+    print("👀 Watching the clipboard — copy a list to sort it (Ctrl+C to stop)\n")
+    try:
+        asyncio.run(watcher.run())
+    except KeyboardInterrupt:
+        print(f"\n👋 Stopped after sorting {watcher.sorts} lists")
+
+
+def write_list(sections, formats):
+    """Print the sorted list and write each requested checklist format"""
+    from datetime import datetime
+
+    from list_renderer import FORMATS, ConsoleRenderer, render, write_outputs
+
+    console = ConsoleRenderer()
+    outputs = {}
+    for name in dict.fromkeys(formats or ["checklist"]):
+        renderer_class, path = FORMATS[name]
+        outputs[path] = renderer_class()
+    render(sections, [console, *outputs.values()], VERSION, datetime.now())
+
+    sys.stdout.write(console.text())
+    write_outputs(outputs)
+    for path in outputs:
+        print(f"✅ Checklist saved to {path}")
+
+
+def compare_stores(args, categorizer, shopping_list):
+    """Print the list in every store's walking order, then a coverage ranking"""
+    from multi_store import MultiStoreIndex, rank_stores
+
+    try:
+        index = MultiStoreIndex(categorizer, args.compare_stores or None)
+    except FileNotFoundError as e:
+        available = ", ".join(list_profiles()) or "none"
+        print(f"⚠️ No store profile file {e.filename} (available: {available})")
+        sys.exit(1)
+    results = index.evaluate(shopping_list)
+
+    for result in results:
+        print(f"=== {result['store']} === {result['items'] - result['unsorted']}/"
+              f"{result['items']} sorted ({result['coverage']:.0%}), "
+              f"{result['sections_visited']} sections\n")
+        for section, items in result["sections"].items():
+            if items:
+                print(f"{section}:")
+                for i in items:
+                    print(f"  • {i}")
+                print()
+
+    print("🏆 Store ranking (fewest unsorted items first):")
+    for rank, result in enumerate(rank_stores(results), 1):
+        print(f"  {rank}. {result['store']}: {result['unsorted']} unsorted, "
+              f"{result['sections_visited']} sections, {result['coverage']:.0%} coverage")
+
+    if args.output:
+        import json
+
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=4, ensure_ascii=False)
+        print(f"✅ Store comparison saved to {args.output}")
+
+
+def load_categorizer(args, result_cache):
+    """Build the Categorizer from the JSON files or the --db store"""
+    if not args.db:
+        try:
+            return Categorizer("sections.json", "keywords.json", result_cache=result_cache,
+                               profile=args.store, fuzzy=not args.no_fuzzy)
+        except FileNotFoundError as e:
+            if not args.store or e.filename != profile_path(args.store):
+                raise
+            available = ", ".join(list_profiles()) or "none"
+            print(f"⚠️ No store profile '{args.store}' (available: {available})")
+            sys.exit(1)
+
+    from sqlite_store import StoreNotFoundError
+
+    store = args.store or "default"
+    try:
+        return Categorizer(result_cache=result_cache, db=args.db, store=store,
+                           fuzzy=not args.no_fuzzy)
+    except StoreNotFoundError:
+        print(f"⚠️ No store named '{store}' in {args.db}. "
+              f"Import one with: python3 sqlite_store.py {args.db} import --store {store}")
+        sys.exit(1)
+    except FileNotFoundError as e:
+        if e.filename != args.db:
+            raise
+        print(f"⚠️ No database {args.db}. "
+              f"Create one with: python3 sqlite_store.py {args.db} import --store {store}")
+        sys.exit(1)
+
+
+def finish_run(args, categorizer, result_cache):
+    """Persist the result cache and stats and write the requested reports"""
+    result_cache.save()
+    if categorizer.keyword_stats is not None:
+        categorizer.keyword_stats.save()
+    if args.cache_stats:
+        stats = result_cache.stats()
+        print(f"🗃️ Result cache: {stats['hits']} hits, {stats['misses']} misses "
+              f"({stats['hit_rate']:.0%} hit rate), {stats['size']} entries",
+              file=sys.stderr)
+    if metrics is not None:
+        metrics.write(args.metrics, version=VERSION, result_cache=result_cache.stats())
+        print(f"📈 Metrics saved to {args.metrics}", file=sys.stderr)
+        if args.metrics_profile:
+            print(f"📈 cProfile stats saved to {args.metrics_profile}", file=sys.stderr)
+
+
+def main():
+    global metrics
+
+    with phase("parse arguments"):
+        args = parse_args(sys.argv[1:])
+    if args.metrics_profile and not args.metrics:
+        args.metrics = "metrics.json"
+    counters = None
+    if args.metrics:
+        from run_metrics import RunMetrics
+
+        counters = dict.fromkeys(WORK_COUNTERS, 0)
+        metrics = RunMetrics(counters, profile_file=args.metrics_profile,
+                             profile_phases=("categorize", "batch categorize", "compare stores"))
+    record_stats = args.keyword_stats and not args.db
+    if args.keyword_stats and args.db:
+        print("⚠️ --keyword-stats only works with keywords.json; not recording with --db",
+              file=sys.stderr)
+    with phase("load sections + keyword index"):
+        # Results served from disk would never be scored, so their keywords
+        # would look dead; recording runs keep the cache in memory only
+        result_cache = ResultCache(path=None if record_stats else args.result_cache)
+        categorizer = load_categorizer(args, result_cache)
+        categorizer.counters = counters
+        if record_stats:
+            from keyword_stats import KeywordStats, stats_path_for
+
+            categorizer.keyword_stats = KeywordStats(stats_path_for(categorizer.keywords_file))
+
+    if args.compact_journal:
+        folded = categorizer.compact_journal()
+        print(f"📝 Folded {folded} learned keywords into keywords.json")
+        return
+
+    if args.batch is not None:
+        with phase("batch categorize") as p:
+            p.items = run_batch_mode(args, categorizer)
+        finish_run(args, categorizer, result_cache)
+        return
+
+    print(f"Grocery List Organizer v{VERSION} (Updated: {LAST_UPDATED})\n")
+
+    if args.review:
+        with phase("review queue"):
+            review_queue(args, categorizer)
+        finish_run(args, categorizer, result_cache)
+        return
+
+    if args.watch:
+        watch_clipboard(args, categorizer)
+        finish_run(args, categorizer, result_cache)
+        return
+
+    if args.compare_stores is not None:
+        with phase("read clipboard") as p:
+            shopping_list = read_shopping_list()
+            p.items = len(shopping_list)
+        with phase("compare stores") as p:
+            compare_stores(args, categorizer, shopping_list)
+            p.items = len(shopping_list)
+        finish_run(args, categorizer, result_cache)
+        return
+
+    if categorizer.profile is not None:
+        print(f"🏪 Store profile: {categorizer.profile_name}\n")
+
+    with phase("read clipboard") as p:
+        shopping_list = read_shopping_list()
+        p.items = len(shopping_list)
+    with phase("categorize") as p:
+        if args.incremental and not record_stats:
+            from incremental_sort import IncrementalSorter
+
+            sorter = IncrementalSorter(categorizer, args.incremental)
+            sections = sorter.sort(shopping_list)
+            sorter.save()
+            if args.cache_stats:
+                print(f"♻️ Incremental: {sorter.reused} lines reused, "
+                      f"{sorter.categorized} categorized", file=sys.stderr)
+        else:
+            sections = categorizer.sort(shopping_list)
+        p.items = len(shopping_list)
+
+    if sections.get(UNSORTED_SECTION):
+        if args.defer:
+            with phase("queue unsorted") as p:
+                p.items = len(sections[UNSORTED_SECTION])
+                defer_unsorted(sections, args.store)
+        else:
+            with phase("interactive categorization") as p:
+                p.items = len(sections[UNSORTED_SECTION])
+                categorize_unsorted(sections, categorizer)
 
-# Save to checklist file
-generated_time = datetime.now()
-formatted_time = generated_time.strftime("%A, %B %d, %Y at %I:%M %p")
+    with phase("output") as p:
+        write_list(sections, args.formats)
+        p.items = len(shopping_list)
 
-with open("shopping_checklist.txt", "w") as f:
-    f.write(f"=== Grocery Checklist === v{VERSION}\n")
-    f.write(f"Generated: {formatted_time}\n\n")
-    for section, items in sections.items():
-        if items:
-            f.write(f"{section}:\n")
-            for i in items:
-                f.write(f"• [ ] {i}\n")
-            f.write("\n")
+    finish_run(args, categorizer, result_cache)
 
-print("✅ Checklist saved to shopping_checklist.txt")
 
+if __name__ == "__main__":
+    main()
+    if profiler:
+        profiler.report()
@@ -0,0 +1,245 @@
+#!/usr/bin/python3
+# grocery_daemon.py
+#-----------------------------------------------------------
+# Long-lived categorization daemon for the Grocery List Organizer
+#
+# Keeps sections.json, keywords.json and the compiled matcher warm in
+# memory and answers requests over a local Unix domain socket, so the
+# launcher, scripts and the section editor don't each pay the full
+# config-load cost.  The configuration is reloaded automatically when
+# either JSON file or the learned-keyword journal changes on disk.
+#
+# Protocol: one JSON object per line in each direction.
+#   {"op": "categorize", "item": "milk"}
+#       -> {"ok": true, "section": "Dairy / Refrigerated"}
+#   {"op": "categorize_many", "items": ["milk", "bread"]}
+#       -> {"ok": true, "sections": ["Dairy / Refrigerated", "Bakery"]}
+#   {"op": "stats"}
+#       -> {"ok": true, "cache": {"hits": ..., "misses": ..., ...}}
+#   {"op": "ping"} / {"op": "reload"} / {"op": "shutdown"}
+#       -> {"ok": true}
+# Errors come back as {"ok": false, "error": "..."}.
+#
+# Usage:
+#   python3 grocery_daemon.py serve
+#   python3 grocery_daemon.py categorize milk "Cottage Cheese"
+#   python3 grocery_daemon.py batch < list.txt
+#   python3 grocery_daemon.py stop
+#-----------------------------------------------------------
+
+import argparse
+import json
+import os
+import socket
+import socketserver
+import sys
+import threading
+
+from categorizer import Categorizer
+from result_cache import ResultCache
+
+
+def default_socket_path():
+    """Per-user socket path, preferring $XDG_RUNTIME_DIR"""
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return os.path.join(runtime_dir, "grocery-list.sock")
+    return f"/tmp/grocery-list-{os.getuid()}.sock"
+
+
+class CategorizerService:
+    """Warm Categorizer that reloads itself when its source files change"""
+
+    def __init__(self, sections_file, keywords_file):
+        self.categorizer = Categorizer(sections_file, keywords_file,
+                                       result_cache=ResultCache())
+        self.lock = threading.Lock()
+        self.stamp = self._source_stamp()
+
+    def _source_stamp(self):
+        c = self.categorizer
+        stamp = []
+        for path in (c.sections_file, c.keywords_file, c.journal_file):
+            try:
+                stamp.append(os.stat(path).st_mtime_ns)
+            except FileNotFoundError:
+                stamp.append(None)
+        return tuple(stamp)
+
+    def _refresh(self):
+        stamp = self._source_stamp()
+        if stamp != self.stamp:
+            if stamp[:2] == self.stamp[:2] and stamp[2] is not None:
+                # Only keywords were learned: rebuild just the journal overlay
+                self.categorizer.reload_journal()
+            else:
+                self.categorizer.reload()
+            self.stamp = stamp
+
+    def handle(self, request):
+        """Dispatch one decoded request and return the response dict"""
+        if not isinstance(request, dict):
+            return {"ok": False, "error": "request must be a JSON object"}
+        op = request.get("op")
+        if op == "categorize" and not isinstance(request.get("item"), str):
+            return {"ok": False, "error": "item must be a string"}
+        if op == "categorize_many" and not (
+                isinstance(request.get("items"), list)
+                and all(isinstance(item, str) for item in request["items"])):
+            return {"ok": False, "error": "items must be a list of strings"}
+        with self.lock:
+            if op in ("categorize", "categorize_many"):
+                self._refresh()
+            if op == "categorize":
+                return {"ok": True, "section": self.categorizer.categorize(request["item"])}
+            if op == "categorize_many":
+                return {"ok": True, "sections": self.categorizer.categorize_many(request["items"])}
+            if op == "reload":
+                self.categorizer.reload()
+                self.stamp = self._source_stamp()
+                return {"ok": True}
+            if op == "stats":
+                return {"ok": True, "cache": self.categorizer.result_cache.stats()}
+            if op in ("ping", "shutdown"):
+                return {"ok": True}
+        return {"ok": False, "error": f"unknown op: {op!r}"}
+
+
+class RequestHandler(socketserver.StreamRequestHandler):
+    """Reads line-delimited JSON requests until the client disconnects"""
+
+    def handle(self):
+        service = self.server.service
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line)
+                response = service.handle(request)
+            except (ValueError, KeyError, TypeError) as e:
+                request = {}
+                response = {"ok": False, "error": str(e)}
+            self.wfile.write(json.dumps(response, ensure_ascii=False).encode("utf-8") + b"\n")
+            self.wfile.flush()
+            if isinstance(request, dict) and request.get("op") == "shutdown":
+                threading.Thread(target=self.server.shutdown, daemon=True).start()
+                return
+
+
+class CategorizerServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def serve(socket_path, sections_file, keywords_file):
+    """Run the daemon until it receives a shutdown request"""
+    service = CategorizerService(sections_file, keywords_file)
+
+    if os.path.exists(socket_path):
+        # Refuse to steal the socket from a daemon that is still running
+        try:
+            client = DaemonClient(socket_path)
+            try:
+                client.request({"op": "ping"})
+            finally:
+                client.close()
+            print(f"⚠️ A daemon is already listening on {socket_path}", file=sys.stderr)
+            return 1
+        except OSError:
+            os.unlink(socket_path)
+
+    server = CategorizerServer(socket_path, RequestHandler)
+    server.service = service
+    os.chmod(socket_path, 0o600)
+    print(f"🛒 Categorization daemon listening on {socket_path}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        try:
+            os.unlink(socket_path)
+        except OSError:
+            pass
+    return 0
+
+
+class DaemonClient:
+    """Thin client keeping one connection open for many requests"""
+
+    def __init__(self, socket_path=None):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.connect(socket_path or default_socket_path())
+        self.rfile = self.sock.makefile("rb")
+
+    def request(self, request):
+        self.sock.sendall(json.dumps(request, ensure_ascii=False).encode("utf-8") + b"\n")
+        line = self.rfile.readline()
+        if not line:
+            raise ConnectionError("daemon closed the connection")
+        response = json.loads(line)
+        if not response.get("ok"):
+            raise RuntimeError(response.get("error", "request failed"))
+        return response
+
+    def categorize(self, item):
+        return self.request({"op": "categorize", "item": item})["section"]
+
+    def categorize_many(self, items):
+        return self.request({"op": "categorize_many", "items": list(items)})["sections"]
+
+    def close(self):
+        self.rfile.close()
+        self.sock.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Grocery list categorization daemon and client")
+    parser.add_argument("--socket", default=default_socket_path(),
+                        help="Unix socket path (default: %(default)s)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    serve_parser = subparsers.add_parser("serve", help="run the daemon in the foreground")
+    serve_parser.add_argument("--sections", default="sections.json")
+    serve_parser.add_argument("--keywords", default="keywords.json")
+
+    categorize_parser = subparsers.add_parser("categorize", help="categorize items given as arguments")
+    categorize_parser.add_argument("items", nargs="+")
+
+    subparsers.add_parser("batch", help="categorize stdin lines, printing 'section<TAB>item'")
+    subparsers.add_parser("reload", help="reload sections.json and keywords.json")
+    subparsers.add_parser("stats", help="print result cache counters")
+    subparsers.add_parser("stop", help="shut the daemon down")
+
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        return serve(args.socket, args.sections, args.keywords)
+
+    try:
+        client = DaemonClient(args.socket)
+    except OSError as e:
+        print(f"⚠️ Could not connect to daemon at {args.socket}: {e}", file=sys.stderr)
+        return 1
+
+    try:
+        if args.command == "categorize":
+            for item, section in zip(args.items, client.categorize_many(args.items)):
+                print(f"{section}\t{item}")
+        elif args.command == "batch":
+            items = [line.strip() for line in sys.stdin if line.strip()]
+            for item, section in zip(items, client.categorize_many(items)):
+                print(f"{section}\t{item}")
+        elif args.command == "stats":
+            print(json.dumps(client.request({"op": "stats"})["cache"], indent=4))
+        elif args.command == "reload":
+            client.request({"op": "reload"})
+        elif args.command == "stop":
+            client.request({"op": "shutdown"})
+    finally:
+        client.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,111 @@
+# incremental_sort.py
+#-----------------------------------------------------------
+# Incremental re-sorting for grocery-list.py --incremental
+#
+# Lists get edited a few lines at a time, so the section of every line
+# from the previous run is kept (keyed by a short hash of the line) in
+# last_sort.json.  Re-sorting looks each line's hash up there; only
+# added or changed lines are normalized and run through the Categorizer
+# (and its result cache), and the walking-order output is regrouped
+# from those per-line results in one pass of dict lookups.
+#
+# Lines are keyed on their raw text rather than the normalized text:
+# identical lines always normalize identically, and normalizing every
+# line would cost as much as a fully cached sort.  Lines that only
+# change cosmetically ("Milk" -> "milk") still hit the result cache.
+# Like the result cache, the state belongs to one configuration
+# version and is dropped when keywords, sections or the profile change.
+#-----------------------------------------------------------
+
+import hashlib
+import json
+import os
+
+STATE_FILE = "last_sort.json"
+STATE_FORMAT = 1
+
+
+def line_key(line):
+    """Return the state key for a list line"""
+    return hashlib.blake2b(line.encode("utf-8"), digest_size=8).hexdigest()
+
+
+class IncrementalSorter:
+    """Categorizer.sort() that only categorizes lines new since the last sort"""
+
+    def __init__(self, categorizer, path=None):
+        self.categorizer = categorizer
+        self.path = path
+        self.version = None
+        # line key -> section for the most recently sorted list
+        self.previous = {}
+        self.reused = 0
+        self.categorized = 0
+        if path:
+            self._load()
+
+    def sort(self, items):
+        """Group items into {section: [items]} in walking order
+
+        Same result as Categorizer.sort(); lines seen in the previous
+        sort reuse their section.
+        """
+        categorizer = self.categorizer
+        if categorizer.version != self.version:
+            self.version = categorizer.version
+            self.previous = {}
+        previous = self.previous
+        current = {}
+        categorize = categorizer.categorize
+        blake2b = hashlib.blake2b
+        reused = 0
+
+        sections = {section: [] for section in categorizer.section_names}
+        for item in items:
+            # Inlined line_key(): hashing is most of the cost of a re-sort
+            key = blake2b(item.encode("utf-8"), digest_size=8).hexdigest()
+            section = current.get(key)
+            if section is None:
+                section = previous.get(key)
+                if section is None:
+                    section = categorize(item)
+                    self.categorized += 1
+                else:
+                    reused += 1
+                current[key] = section
+            else:
+                reused += 1
+            sections.setdefault(section, []).append(item)
+
+        self.reused += reused
+        self.previous = current
+        return sections
+
+    def _load(self):
+        """Load the previous run's results (version checked on first sort)"""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get("format") != STATE_FORMAT or not isinstance(data.get("lines"), dict):
+            return
+        self.version = data.get("version")
+        self.previous = data["lines"]
+
+    def save(self):
+        """Write the latest sort's results for the next run (atomically)"""
+        if not self.path or self.version is None:
+            return
+        data = {
+            "format": STATE_FORMAT,
+            "version": self.version,
+            "lines": self.previous,
+        }
+        tmp_path = self.path + ".tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp_path, self.path)
+        except OSError:
+            pass
@@ -0,0 +1,146 @@
+#!/usr/bin/python3
+# keyword_analysis.py
+#-----------------------------------------------------------
+# Conflict and redundancy report for keywords.json
+#
+# Builds a dict over the normalized keywords (journal included) and,
+# for every keyword, looks up each run of its words.  On normalized
+# text a keyword matches exactly when its words appear as such a run,
+# so this finds every keyword that fires on the keyword itself in
+# O(total words x words per keyword), i.e. linear in practice even
+# for 100k keywords.  Reported:
+#
+#   duplicates - the same keyword listed under several sections
+#   subsumed   - phrases containing a shorter keyword of the same
+#                section ("chocolate milk" when "milk" is listed); they
+#                only add scanning work and bump that section's score
+#   ties       - keywords whose own text scores equally for several
+#                sections, with the tie not broken by the keywords it
+#                contains as written, so walking order silently decides
+#
+# Usage:
+#   python3 keyword_analysis.py [--limit 20] [--json report.json]
+#-----------------------------------------------------------
+
+import argparse
+import json
+import sys
+
+from keyword_index import literal_scores, load_keyword_index
+from normalize import normalize_keywords, plain_forms
+
+
+def keyword_sections(keywords):
+    """Return {normalized keyword: [section, ...]} in keywords.json order"""
+    sections = {}
+    for section, keys in normalize_keywords(keywords).items():
+        for k in keys:
+            sections.setdefault(k, []).append(section)
+    return sections
+
+
+def contained_keywords(keyword, sections, max_words):
+    """Return the keywords (including keyword) that match inside keyword"""
+    words = keyword.split()
+    found = []
+    for start in range(len(words)):
+        for end in range(start + 1, min(len(words), start + max_words) + 1):
+            run = " ".join(words[start:end])
+            if run in sections:
+                found.append(run)
+    return found
+
+
+def analyze(keywords, section_names):
+    """Return {"duplicates": [...], "subsumed": [...], "ties": [...]}"""
+    sections = keyword_sections(keywords)
+    max_words = max((len(k.split()) for k in sections), default=1)
+    order = {section: i for i, section in enumerate(section_names)}
+    forms = plain_forms(keywords)
+
+    duplicates = []
+    subsumed = []
+    ties = []
+    for keyword, owners in sections.items():
+        if len(owners) > 1:
+            duplicates.append({"keyword": keyword, "sections": owners})
+
+        contained = contained_keywords(keyword, sections, max_words)
+        for section in owners:
+            covering = [k for k in contained if k != keyword and section in sections[k]]
+            if covering:
+                subsumed.append({"keyword": keyword, "section": section,
+                                 "covered_by": covering})
+
+        if len(owners) > 1 or len(contained) == 1:
+            continue
+        # Score the keyword's own text like the matcher would
+        scores = {}
+        hits = []
+        for k in contained:
+            for section in sections[k]:
+                if section in order:
+                    scores[section] = scores.get(section, 0) + 1
+                    hits.append((section, k))
+        if not scores:
+            continue
+        top = max(scores.values())
+        tied = [s for s, score in scores.items() if score == top]
+        if len(tied) > 1:
+            # Tie-break as pick_best does, on the keyword as written
+            written = forms.get((owners[0], keyword), (keyword,))[0]
+            literal = literal_scores(hits, written, forms)
+            best = max(literal.get(s, 0) for s in tied)
+            tied = [s for s in tied if literal.get(s, 0) == best]
+        tied.sort(key=order.get)
+        if len(tied) > 1:
+            ties.append({"keyword": keyword, "score": top, "winner": tied[0],
+                         "tied": tied[1:]})
+
+    return {"duplicates": duplicates, "subsumed": subsumed, "ties": ties}
+
+
+def print_report(report, limit):
+    for title, key, describe in (
+            ("Cross-section duplicates", "duplicates",
+             lambda e: f"{e['keyword']!r}: {', '.join(e['sections'])}"),
+            ("Covered by a shorter keyword in the same section", "subsumed",
+             lambda e: f"{e['keyword']!r} ({e['section']}) ⊇ "
+                       f"{', '.join(map(repr, e['covered_by']))}"),
+            ("Phrases that tie (walking order decides)", "ties",
+             lambda e: f"{e['keyword']!r}: {e['winner']} wins over "
+                       f"{', '.join(e['tied'])} at score {e['score']}")):
+        entries = report[key]
+        print(f"{title}: {len(entries)}")
+        for entry in entries[:limit]:
+            print(f"  - {describe(entry)}")
+        if len(entries) > limit:
+            print(f"  ... {len(entries) - limit} more")
+        print()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report keyword conflicts and redundancy")
+    parser.add_argument("--keywords", default="keywords.json", help="keyword file")
+    parser.add_argument("--sections", default="sections.json", help="sections file")
+    parser.add_argument("--limit", type=int, default=20,
+                        help="entries shown per category (default: 20)")
+    parser.add_argument("--json", metavar="FILE", help="also write the full report as JSON")
+    args = parser.parse_args()
+
+    with open(args.sections, "r", encoding="utf-8") as f:
+        section_names = json.load(f)
+    # Includes learned keywords from the journal
+    index = load_keyword_index(args.keywords)
+    report = analyze(index.keywords, section_names)
+
+    print_report(report, args.limit)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=4, ensure_ascii=False)
+        print(f"✅ Report saved to {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
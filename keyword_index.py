@@ -0,0 +1,221 @@
+# keyword_index.py
+#-----------------------------------------------------------
+# Persistent compiled keyword index for grocery-list.py
+#
+# Parsing keywords.json and compiling the matcher is cached in a
+# pickle stored next to the source file (keywords.json -> keywords.index).
+# The cache is reused while the source file's mtime and SHA-256 are
+# unchanged and rebuilt automatically as soon as either differs.
+# A trigram FuzzyIndex for misspellings is built and cached with it.
+# The matcher is built over normalized keywords (normalize.py), so
+# callers score normalized item text; plain_forms records how keywords
+# changed by singularizing were written, for breaking score ties.
+#
+# Learned keywords in keywords.journal are not part of the cache: they
+# get their own small matcher layered over the cached index on load
+# (like a store profile's extra keywords), so learning a keyword never
+# invalidates or rebuilds the compiled keywords.json index.
+#-----------------------------------------------------------
+
+import hashlib
+import json
+import os
+import pickle
+
+from fuzzy_index import FuzzyIndex
+from keyword_journal import apply_journal, journal_path_for, parse_journal, read_journal_bytes
+from keyword_matcher import KeywordMatcher
+from normalize import normalize, normalize_keywords, normalize_plain, plain_forms, singularize_text
+
+# Bump whenever the pickled layout of KeywordIndex, normalization or
+# scoring changes (also part of the result cache version)
+INDEX_FORMAT = 7
+
+
+class KeywordIndex:
+    """Parsed keywords plus the exact and fuzzy matchers built from them"""
+
+    def __init__(self, keywords, source_mtime=None, source_hash=None):
+        self.format = INDEX_FORMAT
+        self.source_mtime = source_mtime
+        # Identifies keywords.json; with a journal overlay, keywords.json
+        # plus the journal (see overlay_journal)
+        self.source_hash = source_hash
+        self.file_hash = source_hash
+        self.keywords = keywords
+        normalized = normalize_keywords(keywords)
+        self.matcher = KeywordMatcher(normalized)
+        self.fuzzy = FuzzyIndex(normalized)
+        self.file_plain_forms = self.plain_forms = plain_forms(keywords)
+        # Learned keywords not already in keywords.json, if any
+        self.journal_matcher = None
+        self.matchers = [self.matcher]
+
+    def overlay_journal(self, journal_raw):
+        """Layer the learned keywords of a journal over the keywords.json index
+
+        Only the journal's own keywords are compiled, so this costs
+        O(journal) however large keywords.json is.  Calling it again
+        with the grown journal replaces the previous overlay.
+        """
+        entries = parse_journal(journal_raw.decode("utf-8").splitlines())
+        apply_journal(self.keywords, entries)
+        matcher = self.matcher
+        learned = {}
+        for section, keyword in entries:
+            kid = matcher.keyword_ids.get(normalize(keyword))
+            if kid is None or section not in matcher.sections[kid]:
+                learned.setdefault(section, []).append(keyword)
+        normalized = normalize_keywords(learned)
+        self.journal_matcher = KeywordMatcher(normalized) if learned else None
+        self.matchers = [matcher]
+        if self.journal_matcher is not None:
+            self.matchers.append(self.journal_matcher)
+        self.fuzzy.add_words(normalized)
+        self.plain_forms = self._journal_plain_forms(entries)
+        self.source_hash = hashlib.sha256(
+            self.file_hash.encode("ascii") + b"\0" + journal_raw).hexdigest()
+
+    def _journal_plain_forms(self, entries):
+        """Return plain_forms for keywords.json plus the journal entries"""
+        forms = dict(self.file_plain_forms)
+        matcher = self.matcher
+        learned = set()
+        for section, keyword in entries:
+            plain = normalize_plain(keyword)
+            key = (section, singularize_text(plain))
+            written = forms.get(key)
+            if written is None:
+                if plain == key[1]:
+                    learned.add(key)
+                    continue
+                # Without an entry, a listed keyword is written as itself
+                kid = matcher.keyword_ids.get(key[1])
+                listed = key in learned or (kid is not None and section in matcher.sections[kid])
+                written = (key[1],) if listed else ()
+            if plain not in written:
+                forms[key] = written + (plain,)
+            learned.add(key)
+        return forms
+
+    def score(self, text):
+        """Return {section: score} for already-normalized text"""
+        scores = self.matcher.score(text)
+        if self.journal_matcher is not None:
+            for section, score in self.journal_matcher.score(text).items():
+                scores[section] = scores.get(section, 0) + score
+        return scores
+
+
+def pick_best(scores, section_names, tie_break=None):
+    """Return the top-scoring section in section_names, or None if all are 0
+
+    When several sections share the top score, tie_break() (only called
+    then) may return {section: score} to decide between them; remaining
+    ties go to the section listed first in section_names (walking order).
+    """
+    if not scores:
+        return None
+    best = max(section_names, key=lambda section: scores.get(section, 0))
+    top = scores.get(best, 0)
+    if not top:
+        return None
+    # scores only holds the sections that were hit, so counting is cheap
+    if tie_break is not None and sum(1 for score in scores.values() if score == top) > 1:
+        tied = [section for section in section_names if scores.get(section, 0) == top]
+        if len(tied) > 1:
+            literal = tie_break()
+            best = max(tied, key=lambda section: literal.get(section, 0))
+    return best
+
+
+def literal_scores(hits, plain_text, forms, rename=None):
+    """Return {section: number of hits found in plain_text as written}
+
+    hits are (section, normalized keyword) pairs found in the normalized
+    text, forms a plain_forms() mapping and plain_text the item's
+    normalize_plain() text.  Sections are reported through rename.
+    """
+    rename = rename or {}
+    padded = f" {plain_text} "
+    scores = {}
+    for key in hits:
+        for form in forms.get(key, key[1:]):
+            if f" {form} " in padded:
+                section = rename.get(key[0], key[0])
+                scores[section] = scores.get(section, 0) + 1
+                break
+    return scores
+
+
+def index_path_for(keywords_file):
+    """Return the cache file path used for keywords_file"""
+    root, _ = os.path.splitext(keywords_file)
+    return root + ".index"
+
+
+def _read_cache(index_file):
+    """Load a cached KeywordIndex, or None if missing or unreadable"""
+    try:
+        with open(index_file, "rb") as f:
+            index = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+        return None
+    if getattr(index, "format", None) != INDEX_FORMAT:
+        return None
+    return index
+
+
+def _write_cache(index, index_file):
+    """Atomically write index to index_file; failures are non-fatal"""
+    # Only needed on a cache miss, so kept off the startup path
+    import tempfile
+
+    directory = os.path.dirname(os.path.abspath(index_file))
+    tmp_path = None
+    try:
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(index, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, index_file)
+    except OSError:
+        if tmp_path is not None:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+
+
+def read_journal_raw(keywords_file):
+    """Return the raw journal bytes for keywords_file (b"" if there is none)"""
+    return read_journal_bytes(journal_path_for(keywords_file))
+
+
+def load_keyword_index(keywords_file="keywords.json", use_cache=True):
+    """Return a KeywordIndex for keywords_file, reusing the cache when valid
+
+    The cache only depends on keywords_file; the learned-keyword journal
+    is overlaid afterwards.
+    """
+    with open(keywords_file, "rb") as f:
+        raw = f.read()
+    mtime = os.stat(keywords_file).st_mtime_ns
+    digest = hashlib.sha256(raw).hexdigest()
+    index_file = index_path_for(keywords_file)
+
+    index = None
+    if use_cache:
+        cached = _read_cache(index_file)
+        if (cached is not None and cached.source_mtime == mtime
+                and cached.file_hash == digest):
+            index = cached
+    if index is None:
+        index = KeywordIndex(json.loads(raw), source_mtime=mtime, source_hash=digest)
+        if use_cache:
+            # Written before the overlay, so the cache never holds journal keywords
+            _write_cache(index, index_file)
+
+    journal_raw = read_journal_raw(keywords_file)
+    if journal_raw:
+        index.overlay_journal(journal_raw)
+    return index
@@ -0,0 +1,156 @@
+# keyword_journal.py
+#-----------------------------------------------------------
+# Append-only journal of learned keywords
+#
+# Learning a keyword appends one JSON line to keywords.journal instead
+# of rewriting the whole keywords.json, so it costs O(1) I/O however
+# large the corpus gets and a crash can at worst lose the line being
+# written.  The loader applies the journal on top of keywords.json;
+# compact() folds it back in with an atomic replace and clears it.
+# compact() first moves the journal aside (keywords.journal.compacting),
+# so keywords learned while it runs start a fresh journal instead of
+# being deleted with the old one.
+#-----------------------------------------------------------
+
+import json
+import os
+
+# Fold the journal into keywords.json once it holds this many entries
+COMPACT_THRESHOLD = 200
+
+
+def journal_path_for(keywords_file):
+    """Return the journal file path used for keywords_file"""
+    root, _ = os.path.splitext(keywords_file)
+    return root + ".journal"
+
+
+def compacting_path(journal_file):
+    """Return where compact() moves journal_file while folding it in"""
+    return journal_file + ".compacting"
+
+
+def append_lines(path, lines, fsync=False):
+    """Append text lines to a JSON Lines file in one write
+
+    Shared by the journal and the review queue, whose readers skip a
+    line torn by a crash.
+    """
+    if not lines:
+        return
+    data = ("\n".join(lines) + "\n").encode("utf-8")
+    with open(path, "ab+") as f:
+        # Start on a fresh line if a previous append was torn by a crash
+        if f.tell() > 0:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                data = b"\n" + data
+        f.write(data)
+        if fsync:
+            f.flush()
+            os.fsync(f.fileno())
+
+
+def append_keywords(journal_file, new_keywords):
+    """Append {section: [keyword, ...]} to the journal and fsync it"""
+    lines = []
+    for section, keys in new_keywords.items():
+        for keyword in keys:
+            lines.append(json.dumps({"section": section, "keyword": keyword},
+                                    ensure_ascii=False))
+    append_lines(journal_file, lines, fsync=True)
+
+
+def parse_journal(lines):
+    """Return [(section, keyword), ...]; a torn trailing line is ignored"""
+    entries = []
+    for line in lines:
+        try:
+            entry = json.loads(line)
+            entries.append((entry["section"], entry["keyword"]))
+        except (ValueError, KeyError, TypeError):
+            continue
+    return entries
+
+
+def read_journal_bytes(journal_file):
+    """Return the raw journal (b"" if there is none)
+
+    A journal still moved aside by compact() comes first: until it has
+    been folded into keywords.json its keywords are still learned ones.
+    """
+    data = b""
+    for path in (compacting_path(journal_file), journal_file):
+        try:
+            with open(path, "rb") as f:
+                chunk = f.read()
+        except FileNotFoundError:
+            continue
+        if data and not data.endswith(b"\n"):
+            data += b"\n"
+        data += chunk
+    return data
+
+
+def read_journal(journal_file):
+    """Return the parsed entries of journal_file ([] if it does not exist)"""
+    return parse_journal(read_journal_bytes(journal_file).decode("utf-8").splitlines())
+
+
+def apply_journal(keywords, entries):
+    """Merge journal entries into keywords in place
+
+    Keywords already listed for a section are skipped, which keeps
+    replaying a journal idempotent (e.g. after an interrupted compaction).
+    """
+    seen = {}
+    for section, keyword in entries:
+        keys = keywords.setdefault(section, [])
+        known = seen.get(section)
+        if known is None:
+            known = seen[section] = set(keys)
+        if keyword not in known:
+            keys.append(keyword)
+            known.add(keyword)
+    return keywords
+
+
+def compact(keywords_file, journal_file=None):
+    """Fold the journal into keywords_file atomically; return entries folded
+
+    A journal left aside by an interrupted compaction is folded in first.
+    """
+    journal_file = journal_file or journal_path_for(keywords_file)
+    aside = compacting_path(journal_file)
+    folded = 0
+    if os.path.exists(aside):
+        folded += _fold(keywords_file, aside)
+    try:
+        # Appends from here on go to a new journal
+        os.replace(journal_file, aside)
+    except FileNotFoundError:
+        return folded
+    return folded + _fold(keywords_file, aside)
+
+
+def _fold(keywords_file, aside):
+    """Fold the moved-aside journal into keywords_file, then delete it"""
+    with open(aside, "r", encoding="utf-8") as f:
+        entries = parse_journal(f)
+    if not entries:
+        os.unlink(aside)
+        return 0
+
+    with open(keywords_file, "r", encoding="utf-8") as f:
+        keywords = json.load(f)
+    apply_journal(keywords, entries)
+
+    tmp_path = keywords_file + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(keywords, f, indent=4)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, keywords_file)
+    # Only cleared once keywords.json is safely replaced
+    os.unlink(aside)
+    return len(entries)
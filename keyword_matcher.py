@@ -0,0 +1,125 @@
+# keyword_matcher.py
+#-----------------------------------------------------------
+# Single-pass keyword matcher for grocery-list.py
+#
+# Compiles every keyword in keywords.json once into an Aho-Corasick
+# automaton so an item is scanned a single time no matter how many
+# keywords there are.  A hit only counts when it sits on word
+# boundaries, mirroring the old per-keyword
+#     re.search(r'\b' + re.escape(k) + r'\b', item)
+# loop, so per-section scores are identical.
+#-----------------------------------------------------------
+
+
+def is_word_char(ch):
+    """Return True for characters regex \\w treats as word characters"""
+    return ch.isalnum() or ch == "_"
+
+
+def at_word_boundary(text, pos):
+    """Return True when regex \\b would match at text[pos]"""
+    before = pos > 0 and is_word_char(text[pos - 1])
+    after = pos < len(text) and is_word_char(text[pos])
+    return before != after
+
+
+class KeywordMatcher:
+    """Aho-Corasick automaton over all keywords of all sections"""
+
+    def __init__(self, keywords):
+        # keywords: {section: [keyword, ...]} as loaded from keywords.json
+        self.keywords = []       # keyword id -> keyword text
+        self.keyword_ids = {}    # keyword text -> keyword id
+        self.sections = []       # keyword id -> [section, ...] (one per occurrence)
+        self.empty_sections = []  # sections listing "" (matches any word boundary)
+
+        for section, keys in keywords.items():
+            for k in keys:
+                if k == "":
+                    self.empty_sections.append(section)
+                    continue
+                kid = self.keyword_ids.get(k)
+                if kid is None:
+                    kid = len(self.keywords)
+                    self.keyword_ids[k] = kid
+                    self.keywords.append(k)
+                    self.sections.append([])
+                self.sections[kid].append(section)
+
+        self._build()
+
+    def _build(self):
+        """Build the goto, failure and output tables"""
+        goto = [{}]
+        output = [[]]
+
+        for kid, k in enumerate(self.keywords):
+            state = 0
+            for ch in k:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][ch] = nxt
+                    goto.append({})
+                    output.append([])
+                state = nxt
+            output[state].append(kid)
+
+        # Breadth-first pass to compute failure links and merge outputs
+        fail = [0] * len(goto)
+        queue = list(goto[0].values())
+        head = 0
+        while head < len(queue):
+            state = queue[head]
+            head += 1
+            for ch, nxt in goto[state].items():
+                queue.append(nxt)
+                f = fail[state]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                target = goto[f].get(ch, 0)
+                fail[nxt] = target if target != nxt else 0
+                if output[fail[nxt]]:
+                    output[nxt] = output[nxt] + output[fail[nxt]]
+
+        self._goto = goto
+        self._fail = fail
+        self._output = output
+
+    def find(self, text):
+        """Return the set of keyword ids found on word boundaries in text"""
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        keywords = self.keywords
+        found = set()
+        state = 0
+
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if output[state]:
+                end = i + 1
+                for kid in output[state]:
+                    if kid in found:
+                        continue
+                    start = end - len(keywords[kid])
+                    if at_word_boundary(text, start) and at_word_boundary(text, end):
+                        found.add(kid)
+        return found
+
+    def score(self, text):
+        """Return {section: number of matching keywords} for text"""
+        return self.section_scores(self.find(text), text)
+
+    def section_scores(self, found, text):
+        """Return {section: score} for keyword ids already found in text"""
+        scores = {}
+        for kid in found:
+            for section in self.sections[kid]:
+                scores[section] = scores.get(section, 0) + 1
+        if self.empty_sections and any(is_word_char(ch) for ch in text):
+            for section in self.empty_sections:
+                scores[section] = scores.get(section, 0) + 1
+        return scores
@@ -0,0 +1,140 @@
+# keyword_search.py
+#-----------------------------------------------------------
+# Search-as-you-type index over keywords.json for section_editor.py
+#
+# The keywords are kept sorted (casefolded) and also joined into one
+# newline-separated string.  Prefix matches are a contiguous run found
+# by bisecting the sorted list and are listed first; substring matches
+# come from str.find over the joined string, with each hit mapped back
+# to its keyword by bisecting the line offsets.  Both run at C speed
+# and stop once `limit` results are found, so every keystroke returns
+# in a few milliseconds even for 100k keywords.
+#
+# Bulk edits never rebuild the index: moving keywords only relabels
+# their section and deleting only marks them.  keywords() turns the
+# entries back into the {section: [keyword, ...]} layout for saving,
+# with moved keywords appended to their new section.
+#-----------------------------------------------------------
+
+from bisect import bisect_left, bisect_right
+
+# Results returned per search
+MAX_RESULTS = 1000
+
+
+class KeywordSearchIndex:
+    """Prefix/substring search over keywords with in-place bulk edits"""
+
+    def __init__(self, keywords):
+        # Section order of keywords.json, kept when saving
+        self.section_names = list(keywords)
+        entries = []
+        for section, keys in keywords.items():
+            for keyword in keys:
+                entries.append((keyword.casefold(), len(entries), keyword, section))
+        entries.sort()
+
+        self.folded = [e[0] for e in entries]
+        # Position in keywords.json order; moved keywords get a new one
+        self.order = [e[1] for e in entries]
+        self.words = [e[2] for e in entries]
+        # Section of every entry, None once deleted
+        self.sections = [e[3] for e in entries]
+        self.next_order = len(entries)
+        self.live = len(entries)
+        self.changed = False
+
+        self.text = "\n".join(self.folded)
+        # Offset of every line in text, plus a sentinel past the end
+        self.starts = []
+        offset = 0
+        for folded in self.folded:
+            self.starts.append(offset)
+            offset += len(folded) + 1
+        self.starts.append(offset)
+
+    def __len__(self):
+        """Number of keywords not deleted"""
+        return self.live
+
+    def search(self, query, section=None, limit=MAX_RESULTS):
+        """Return (entry ids, more) for keywords containing query
+
+        Prefix matches come first, then other substring matches, both in
+        alphabetical order.  Only entries in section are returned when
+        it is given.  more is True when results were cut off at limit.
+        """
+        # Spaces are kept: "ice " finds "ice cream" but not "juice"
+        query = query.casefold().replace("\n", " ")
+        sections = self.sections
+        ids = []
+        if not query.strip():
+            for i, owner in enumerate(sections):
+                if owner is not None and (section is None or owner == section):
+                    ids.append(i)
+                    if len(ids) > limit:
+                        break
+            return ids[:limit], len(ids) > limit
+
+        folded = self.folded
+        first = i = bisect_left(folded, query)
+        while i < len(folded) and folded[i].startswith(query) and len(ids) <= limit:
+            owner = sections[i]
+            if owner is not None and (section is None or owner == section):
+                ids.append(i)
+            i += 1
+        prefix_end = i
+
+        text = self.text
+        starts = self.starts
+        pos = text.find(query)
+        while pos != -1 and len(ids) <= limit:
+            i = bisect_right(starts, pos) - 1
+            owner = sections[i]
+            if ((i < first or i >= prefix_end) and owner is not None
+                    and (section is None or owner == section)):
+                ids.append(i)
+            # Continue on the next line: one hit per keyword is enough
+            pos = text.find(query, starts[i + 1])
+        return ids[:limit], len(ids) > limit
+
+    def move(self, ids, section):
+        """Move entries to section (appended after its existing keywords)"""
+        for i in ids:
+            if self.sections[i] is not None and self.sections[i] != section:
+                self.sections[i] = section
+                self.order[i] = self.next_order
+                self.next_order += 1
+                self.changed = True
+        if section not in self.section_names:
+            self.section_names.append(section)
+
+    def delete(self, ids):
+        for i in ids:
+            if self.sections[i] is not None:
+                self.sections[i] = None
+                self.live -= 1
+                self.changed = True
+
+    def section_counts(self):
+        """Return {section: live keyword count}"""
+        counts = dict.fromkeys(self.section_names, 0)
+        for owner in self.sections:
+            if owner is not None:
+                counts[owner] += 1
+        return counts
+
+    def keywords(self):
+        """Return {section: [keyword, ...]} for writing keywords.json
+
+        Every original section is kept (possibly empty); a keyword moved
+        into a section that already lists it appears there once.
+        """
+        keywords = {section: [] for section in self.section_names}
+        seen = {section: set() for section in self.section_names}
+        for i in sorted(range(len(self.order)), key=self.order.__getitem__):
+            owner = self.sections[i]
+            if owner is not None and self.words[i] not in seen[owner]:
+                seen[owner].add(self.words[i])
+                keywords[owner].append(self.words[i])
+        return keywords
@@ -0,0 +1,197 @@
+#!/usr/bin/python3
+# keyword_stats.py
+#-----------------------------------------------------------
+# Keyword hit-rate statistics and dead-keyword pruning
+#
+# With grocery-list.py --keyword-stats every run counts which keywords
+# matched an item and adds the counts to keywords.stats, a compact JSON
+# file next to keywords.json:
+#
+#   {"format": 1, "runs": 12,
+#    "keywords": {"<normalized keyword>": [hits, last run with a hit], ...},
+#    "sections": {"<section>": hits, ...}}
+#
+# Only keywords that ever matched (or were learned during a recorded
+# run) have an entry, so the file stays small and recording costs one
+# counter update per keyword hit.
+#
+# Usage:
+#   python3 keyword_stats.py report [--top 20]
+#   python3 keyword_stats.py prune --runs 20 [--dry-run]
+# prune removes keywords.json entries with no hit in the last N
+# recorded runs (learned keywords are folded in from the journal first).
+#-----------------------------------------------------------
+
+import argparse
+import json
+import os
+import sys
+from collections import Counter
+
+from keyword_journal import compact, journal_path_for
+from normalize import normalize
+
+STATS_FORMAT = 1
+
+
+def stats_path_for(keywords_file):
+    """Return the stats file path used for keywords_file"""
+    root, _ = os.path.splitext(keywords_file)
+    return root + ".stats"
+
+
+def read_stats(stats_file):
+    """Return the stats dict from stats_file (empty stats if missing)"""
+    try:
+        with open(stats_file, "r", encoding="utf-8") as f:
+            stats = json.load(f)
+    except (FileNotFoundError, ValueError):
+        stats = {}
+    if stats.get("format") != STATS_FORMAT:
+        stats = {"format": STATS_FORMAT, "runs": 0, "keywords": {}, "sections": {}}
+    return stats
+
+
+def write_stats(stats, stats_file):
+    """Atomically replace stats_file with stats"""
+    tmp_path = stats_file + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(stats, f, separators=(",", ":"), ensure_ascii=False)
+    os.replace(tmp_path, stats_file)
+
+
+class KeywordStats:
+    """Hit counts for one run, merged into the stats file by save()"""
+
+    def __init__(self, stats_file):
+        self.stats_file = stats_file
+        self.keyword_hits = Counter()    # normalized keyword -> hits this run
+        self.section_hits = Counter()    # section -> keyword hits this run
+        self.learned = set()             # normalized keywords learned this run
+
+    def record(self, matcher, found):
+        """Count the keyword ids matcher found in one item"""
+        keywords = matcher.keywords
+        sections = matcher.sections
+        for kid in found:
+            self.keyword_hits[keywords[kid]] += 1
+            for section in sections[kid]:
+                self.section_hits[section] += 1
+
+    def merge(self, keyword_hits, section_hits):
+        """Add hit counts recorded elsewhere (e.g. in a worker process)"""
+        self.keyword_hits.update(keyword_hits)
+        self.section_hits.update(section_hits)
+
+    def mark_learned(self, new_keywords):
+        """Give keywords learned this run a fresh last-hit run"""
+        for keys in new_keywords.values():
+            self.learned.update(filter(None, map(normalize, keys)))
+
+    def save(self):
+        """Add this run to the stats file"""
+        stats = read_stats(self.stats_file)
+        stats["runs"] += 1
+        run = stats["runs"]
+        keywords = stats["keywords"]
+        for keyword in self.learned:
+            keywords.setdefault(keyword, [0, run])[1] = run
+        for keyword, hits in self.keyword_hits.items():
+            entry = keywords.setdefault(keyword, [0, run])
+            entry[0] += hits
+            entry[1] = run
+        sections = stats["sections"]
+        for section, hits in self.section_hits.items():
+            sections[section] = sections.get(section, 0) + hits
+        write_stats(stats, self.stats_file)
+
+
+def dead_keywords(keywords, stats, runs):
+    """Return [(section, keyword), ...] with no hit in the last runs runs
+
+    Keywords without an entry never matched since recording started.
+    Nothing is dead until at least runs runs have been recorded.
+    """
+    total = stats["runs"]
+    if total < runs:
+        return []
+    hit_stats = stats["keywords"]
+    dead = []
+    for section, keys in keywords.items():
+        for k in keys:
+            entry = hit_stats.get(normalize(k))
+            if entry is None or total - entry[1] >= runs:
+                dead.append((section, k))
+    return dead
+
+
+def prune_keywords(keywords, dead):
+    """Return keywords without the (section, keyword) pairs in dead"""
+    dead = set(dead)
+    return {section: [k for k in keys if (section, k) not in dead]
+            for section, keys in keywords.items()}
+
+
+def report(keywords, stats, top):
+    total = sum(len(keys) for keys in keywords.values())
+    hit_stats = stats["keywords"]
+    never = sum(1 for keys in keywords.values() for k in keys
+                if hit_stats.get(normalize(k), [0])[0] == 0)
+    print(f"{stats['runs']} recorded runs, {total} keywords, {never} never matched")
+
+    print(f"\nTop {top} keywords:")
+    ranked = sorted(hit_stats.items(), key=lambda kv: kv[1][0], reverse=True)
+    for keyword, (hits, last_run) in ranked[:top]:
+        print(f"  {hits:6}  {keyword}  (last hit in run {last_run})")
+
+    print("\nKeyword hits per section:")
+    for section in keywords:
+        print(f"  {stats['sections'].get(section, 0):6}  {section}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Keyword hit statistics and pruning")
+    parser.add_argument("--keywords", default="keywords.json", help="keyword file")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    report_parser = subparsers.add_parser("report", help="show hit counts")
+    report_parser.add_argument("--top", type=int, default=20)
+    prune_parser = subparsers.add_parser(
+        "prune", help="remove keywords with no hits in the last N recorded runs")
+    prune_parser.add_argument("--runs", type=int, default=20, metavar="N")
+    prune_parser.add_argument("--dry-run", action="store_true",
+                              help="only report what would be removed")
+    args = parser.parse_args()
+
+    stats = read_stats(stats_path_for(args.keywords))
+    if args.command == "prune" and not args.dry_run:
+        # Learned keywords must be in keywords.json before it is rewritten
+        compact(args.keywords, journal_path_for(args.keywords))
+    with open(args.keywords, "r", encoding="utf-8") as f:
+        keywords = json.load(f)
+
+    if args.command == "report":
+        report(keywords, stats, args.top)
+        return 0
+
+    if stats["runs"] < args.runs:
+        print(f"Only {stats['runs']} runs recorded; need {args.runs} before pruning "
+              f"(run grocery-list.py --keyword-stats)")
+        return 0
+    dead = dead_keywords(keywords, stats, args.runs)
+    for section, k in dead:
+        print(f"  - {k!r} ({section})")
+    total = sum(len(keys) for keys in keywords.values())
+    print(f"{len(dead)} of {total} keywords had no hits in the last {args.runs} runs")
+
+    if dead and not args.dry_run:
+        tmp_path = args.keywords + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(prune_keywords(keywords, dead), f, indent=4)
+            f.write("\n")
+        os.replace(tmp_path, args.keywords)
+        print(f"📝 Updated {args.keywords}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
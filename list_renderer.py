@@ -0,0 +1,153 @@
+# list_renderer.py
+#-----------------------------------------------------------
+# Single-pass output rendering for grocery-list.py
+#
+# The sorted list is walked once; every requested format receives each
+# section from that same pass and collects its text in a list of parts,
+# which is then written with one write() per output.  The timestamp is
+# taken and formatted once for all formats.
+#
+#   console    - what grocery-list.py prints
+#   checklist  - shopping_checklist.txt ("• [ ] item")
+#   markdown   - shopping_checklist.md (GitHub task list)
+#   json       - shopping_checklist.json
+#   html       - shopping_checklist.html (printable page with checkboxes)
+#-----------------------------------------------------------
+
+import json
+
+TIME_FORMAT = "%A, %B %d, %Y at %I:%M %p"
+
+
+class Renderer:
+    """Collects one format's output from the shared pass"""
+
+    def __init__(self):
+        self.parts = []
+
+    def begin(self, version, generated, formatted_time):
+        pass
+
+    def section(self, name, items):
+        pass
+
+    def end(self):
+        pass
+
+    def text(self):
+        return "".join(self.parts)
+
+
+class ConsoleRenderer(Renderer):
+    def begin(self, version, generated, formatted_time):
+        self.parts.append(f"\n=== Grocery List (Walking Order) === v{version}\n"
+                          f"Generated: {formatted_time}\n\n")
+
+    def section(self, name, items):
+        self.parts.append(f"{name}:\n")
+        self.parts.extend(f"  • {i}\n" for i in items)
+        self.parts.append("\n")
+
+
+class ChecklistRenderer(Renderer):
+    def begin(self, version, generated, formatted_time):
+        self.parts.append(f"=== Grocery Checklist === v{version}\n"
+                          f"Generated: {formatted_time}\n\n")
+
+    def section(self, name, items):
+        self.parts.append(f"{name}:\n")
+        self.parts.extend(f"• [ ] {i}\n" for i in items)
+        self.parts.append("\n")
+
+
+class MarkdownRenderer(Renderer):
+    def begin(self, version, generated, formatted_time):
+        self.parts.append(f"# Grocery Checklist\n\n_Generated {formatted_time} (v{version})_\n\n")
+
+    def section(self, name, items):
+        self.parts.append(f"## {name}\n\n")
+        self.parts.extend(f"- [ ] {i}\n" for i in items)
+        self.parts.append("\n")
+
+
+class JsonRenderer(Renderer):
+    def begin(self, version, generated, formatted_time):
+        self.data = {
+            "version": version,
+            "generated": generated.isoformat(timespec="seconds"),
+            "sections": [],
+        }
+
+    def section(self, name, items):
+        self.data["sections"].append({"section": name, "items": list(items)})
+
+    def end(self):
+        self.parts.append(json.dumps(self.data, indent=4, ensure_ascii=False))
+        self.parts.append("\n")
+
+
+HTML_STYLE = """\
+body { font-family: sans-serif; max-width: 40em; margin: 2em auto; }
+h1 { font-size: 1.4em; margin-bottom: 0; }
+.generated { color: #666; margin-top: 0.2em; }
+h2 { font-size: 1.1em; border-bottom: 1px solid #ccc; margin: 1.2em 0 0.3em; }
+ul { list-style: none; padding-left: 0; margin: 0; }
+li { padding: 0.15em 0; }
+@media print { body { margin: 0; } section { break-inside: avoid; } }
+"""
+
+
+class HtmlRenderer(Renderer):
+    def begin(self, version, generated, formatted_time):
+        # html pulls in its entity tables, so only load it for this format
+        from html import escape
+
+        self.escape = escape
+        self.parts.append(
+            "<!DOCTYPE html>\n<html lang=\"en\">\n<head>\n<meta charset=\"utf-8\">\n"
+            f"<title>Grocery Checklist</title>\n<style>\n{HTML_STYLE}</style>\n</head>\n<body>\n"
+            "<h1>Grocery Checklist</h1>\n"
+            f"<p class=\"generated\">Generated {escape(formatted_time)} (v{escape(version)})</p>\n")
+
+    def section(self, name, items):
+        escape = self.escape
+        self.parts.append(f"<section>\n<h2>{escape(name)}</h2>\n<ul>\n")
+        self.parts.extend(f"<li><label><input type=\"checkbox\"> {escape(i)}</label></li>\n"
+                          for i in items)
+        self.parts.append("</ul>\n</section>\n")
+
+    def end(self):
+        self.parts.append("</body>\n</html>\n")
+
+
+# format name -> (renderer class, default output file)
+FORMATS = {
+    "checklist": (ChecklistRenderer, "shopping_checklist.txt"),
+    "markdown": (MarkdownRenderer, "shopping_checklist.md"),
+    "json": (JsonRenderer, "shopping_checklist.json"),
+    "html": (HtmlRenderer, "shopping_checklist.html"),
+}
+
+
+def render(sections, renderers, version, generated):
+    """Feed {section: [items]} to every renderer in one pass
+
+    Empty sections are skipped.  Returns renderers for chaining.
+    """
+    formatted_time = generated.strftime(TIME_FORMAT)
+    for renderer in renderers:
+        renderer.begin(version, generated, formatted_time)
+    for name, items in sections.items():
+        if items:
+            for renderer in renderers:
+                renderer.section(name, items)
+    for renderer in renderers:
+        renderer.end()
+    return renderers
+
+
+def write_outputs(outputs):
+    """Write {path: renderer}, one buffered write per file"""
+    for path, renderer in outputs.items():
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(renderer.text())
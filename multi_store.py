@@ -0,0 +1,136 @@
+# multi_store.py
+#-----------------------------------------------------------
+# Score one shopping list against several store layouts at once
+#
+# Running grocery-list.py once per store normalizes and matches every
+# item N times.  Here each item is normalized once and scanned once by
+# the shared base matcher plus one small matcher over the union of all
+# profiles' extra keywords; the hits are then mapped to every store
+# through its renames and overlay keywords:
+#
+#     base hit "milk" -> Dairy / Refrigerated -> {default: Dairy / Refrigerated,
+#                                                 aldi: Dairy}
+#
+# Per-store results are identical to Categorizer(profile=name) for each
+# store, including the fuzzy fallback (typo correction only depends on
+# the shared keyword vocabulary, so it also runs once per item).
+#-----------------------------------------------------------
+
+from categorizer import UNSORTED_SECTION
+from keyword_index import literal_scores, pick_best
+from keyword_matcher import KeywordMatcher
+from normalize import normalize_plain, singularize_text
+from store_profiles import STORES_DIR, list_profiles, load_profile
+
+
+class MultiStoreIndex:
+    """The base keyword index plus the section mappings of several stores"""
+
+    def __init__(self, categorizer, profile_names=None, stores_dir=STORES_DIR):
+        # categorizer supplies the base index; its active profile is ignored
+        self.index = categorizer.index
+        self.fuzzy = categorizer.index.fuzzy if categorizer.fuzzy else None
+        if profile_names is None:
+            profile_names = list_profiles(stores_dir)
+
+        base_name = categorizer.store if categorizer.db else "default"
+        self.store_names = [base_name]
+        self.section_names = [categorizer.base_sections]
+        self.renames = [{}]
+        self.plain_forms = [{}]     # per store, for its overlay keywords
+        overlay = {}            # normalized keyword -> [(store, section), ...]
+        for name in profile_names:
+            profile = load_profile(name, categorizer.base_sections, stores_dir)
+            store = len(self.store_names)
+            self.store_names.append(name)
+            self.section_names.append(profile.section_names)
+            self.renames.append(profile.rename)
+            self.plain_forms.append(profile.plain_forms)
+            if profile.matcher is not None:
+                for k, sections in zip(profile.matcher.keywords, profile.matcher.sections):
+                    overlay.setdefault(k, []).extend((store, s) for s in sections)
+
+        # One matcher for every store's extra keywords
+        self.overlay_matcher = KeywordMatcher({"": list(overlay)}) if overlay else None
+        self.overlay_targets = [overlay[k] for k in self.overlay_matcher.keywords] if overlay else []
+
+    def _store_scores(self, text):
+        """Return [{section: score}, ...] for normalized text, one per store"""
+        # keywords.json hits plus learned (journal) keyword hits
+        base_found = [(matcher, matcher.find(text)) for matcher in self.index.matchers]
+        per_store = []
+        for rename in self.renames:
+            scores = {}
+            for matcher, found in base_found:
+                for kid in found:
+                    for section in matcher.sections[kid]:
+                        section = rename.get(section, section)
+                        scores[section] = scores.get(section, 0) + 1
+            per_store.append(scores)
+        if self.overlay_matcher is not None:
+            for kid in self.overlay_matcher.find(text):
+                for store, section in self.overlay_targets[kid]:
+                    scores = per_store[store]
+                    scores[section] = scores.get(section, 0) + 1
+        return per_store
+
+    def _literal_scores(self, text, plain, store):
+        """Return store's {section: hits in text that plain contains as written}"""
+        hits = [(section, matcher.keywords[kid]) for matcher in self.index.matchers
+                for kid in matcher.find(text) for section in matcher.sections[kid]]
+        scores = literal_scores(hits, plain, self.index.plain_forms, self.renames[store])
+        if self.overlay_matcher is not None:
+            keywords = self.overlay_matcher.keywords
+            hits = [(section, keywords[kid]) for kid in self.overlay_matcher.find(text)
+                    for target, section in self.overlay_targets[kid] if target == store]
+            for section, score in literal_scores(hits, plain, self.plain_forms[store]).items():
+                scores[section] = scores.get(section, 0) + score
+        return scores
+
+    def _pick(self, per_store, text, plain, best=None):
+        """pick_best for every store still undecided in best"""
+        best = best or [None] * len(per_store)
+        return [section or pick_best(scores, names,
+                                     lambda store=store: self._literal_scores(text, plain, store))
+                for store, (section, scores, names)
+                in enumerate(zip(best, per_store, self.section_names))]
+
+    def best_sections(self, item):
+        """Return the section item goes to in each store, in store order"""
+        plain = normalize_plain(item)
+        text = singularize_text(plain)
+        best = self._pick(self._store_scores(text), text, plain)
+        if self.fuzzy is not None and None in best:
+            corrected = self.fuzzy.correct(text)
+            if corrected is not None:
+                best = self._pick(self._store_scores(corrected), corrected, plain, best)
+        return [section or UNSORTED_SECTION for section in best]
+
+    def evaluate(self, items):
+        """Sort items for every store; return one result dict per store
+
+        Each result has the store name, its walking-order sections (as
+        Categorizer.sort returns them) and coverage stats.
+        """
+        results = []
+        for name, names in zip(self.store_names, self.section_names):
+            results.append({"store": name,
+                            "sections": {section: [] for section in names}})
+        for item in items:
+            for result, section in zip(results, self.best_sections(item)):
+                result["sections"].setdefault(section, []).append(item)
+
+        for result in results:
+            sections = result["sections"]
+            unsorted = len(sections.get(UNSORTED_SECTION, []))
+            result["items"] = len(items)
+            result["unsorted"] = unsorted
+            result["coverage"] = (len(items) - unsorted) / len(items) if items else 1.0
+            result["sections_visited"] = sum(1 for section, placed in sections.items()
+                                             if placed and section != UNSORTED_SECTION)
+        return results
+
+
+def rank_stores(results):
+    """Return results ordered by fewest unsorted items, then fewest stops"""
+    return sorted(results, key=lambda r: (r["unsorted"], r["sections_visited"]))
@@ -0,0 +1,166 @@
+#!/usr/bin/python3
+# normalize.py
+#-----------------------------------------------------------
+# Text normalization shared by keywords and list items
+#
+# Both sides of a match go through the same pipeline:
+#   casefold -> drop pack sizes ("-24 pk.") -> strip punctuation
+#   -> drop noise phrases ("see email") -> plural -> singular
+# so "bananas"/"banana" or "dole salads"/"dole salad" become the same
+# keyword and the matcher only has to scan for one of them.
+#
+# normalize_plain() is the same pipeline without the singular step.
+# Score ties are broken on the keywords found in the item as written
+# (plain_forms() keeps how each changed keyword was written), so a tie
+# only created by singularizing ("grape juice" against "grapes") still
+# goes to the phrase the item actually contains.
+#
+# Usage:
+#   python3 normalize.py compact [--dry-run] [keywords.json]
+# removes keywords made redundant by normalization.
+#-----------------------------------------------------------
+
+import json
+import os
+import re
+import sys
+
+# Promotional or note text that never says what the item is
+NOISE_PHRASES = [
+    "see email",
+    "friday freebie",
+    "free price chopper",
+]
+
+# Singular nouns ending in "ie" whose "-ies" plural is not "-y"
+# ("cookies" -> "cookie", not "cooky").  Stems of one or two letters
+# ("pies", "ties") are handled by length.
+IE_WORDS = frozenset({
+    "brownie", "calorie", "cookie", "goodie", "hoagie", "smoothie", "veggie",
+})
+
+_PACK_SIZE = re.compile(r"\b\d+\s*(?:pk|pack|ct|count)\b\.?")
+_PUNCTUATION = re.compile(r"[^\w\s]|_")
+_NOISE = re.compile(r"\b(?:" + "|".join(re.escape(p) for p in NOISE_PHRASES) + r")\b")
+
+
+def singularize(word):
+    """Cheap plural -> singular; only has to be consistent, not perfect"""
+    if len(word) <= 3 or not word.endswith("s") or word.isdigit():
+        return word
+    if word.endswith("ies"):
+        stem = word[:-3]
+        if len(stem) <= 2 or stem + "ie" in IE_WORDS:
+            return stem + "ie"
+        return stem + "y"
+    if word.endswith(("sses", "ches", "shes", "xes", "oes")):
+        return word[:-2]
+    if word.endswith(("ss", "us", "is")):
+        return word
+    return word[:-1]
+
+
+def normalize_plain(text):
+    """Return the normalized form of text without singularizing its words"""
+    text = text.casefold()
+    text = _PACK_SIZE.sub(" ", text)
+    # Apostrophes join words ("lay's" -> "lays"); other punctuation splits
+    text = _PUNCTUATION.sub(lambda m: "" if m.group() == "'" else " ", text)
+    text = _NOISE.sub(" ", text)
+    return " ".join(text.split())
+
+
+def singularize_text(plain):
+    """Return the normalized form of normalize_plain() output"""
+    return " ".join(singularize(word) for word in plain.split())
+
+
+def normalize(text):
+    """Return the normalized form of a keyword or list item"""
+    return singularize_text(normalize_plain(text))
+
+
+def normalize_keywords(keywords):
+    """Return {section: [normalized keyword, ...]} without duplicates"""
+    normalized = {}
+    for section, keys in keywords.items():
+        seen = set()
+        out = normalized[section] = []
+        for k in keys:
+            n = normalize(k)
+            if n and n not in seen:
+                seen.add(n)
+                out.append(n)
+    return normalized
+
+
+def plain_forms(keywords):
+    """Return {(section, normalized keyword): (plain form, ...)} for keywords.json
+
+    Only keywords that singularizing changes have an entry; every
+    other keyword is written as its normalized form.
+    """
+    forms = {}
+    for section, keys in keywords.items():
+        for k in keys:
+            plain = normalize_plain(k)
+            written = forms.setdefault((section, singularize_text(plain)), [])
+            if plain and plain not in written:
+                written.append(plain)
+    return {key: tuple(written) for key, written in forms.items() if written != [key[1]]}
+
+
+def compact_keywords(keywords):
+    """Drop keywords whose normalized form repeats an earlier one in the section
+
+    Returns (compacted keywords, [(section, removed keyword), ...]).  The
+    first spelling of each keyword is kept as written.
+    """
+    compacted = {}
+    removed = []
+    for section, keys in keywords.items():
+        seen = set()
+        kept = compacted[section] = []
+        for k in keys:
+            n = normalize(k)
+            if not n or n in seen:
+                removed.append((section, k))
+            else:
+                seen.add(n)
+                kept.append(k)
+    return compacted, removed
+
+
+def main():
+    # Only the CLI needs argparse; normalize() is on every run's import path
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Keyword normalization tools")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    compact_parser = subparsers.add_parser(
+        "compact", help="remove keywords made redundant by normalization")
+    compact_parser.add_argument("keywords_file", nargs="?", default="keywords.json")
+    compact_parser.add_argument("--dry-run", action="store_true",
+                                help="only report what would be removed")
+    args = parser.parse_args()
+
+    with open(args.keywords_file, "r", encoding="utf-8") as f:
+        keywords = json.load(f)
+    compacted, removed = compact_keywords(keywords)
+
+    for section, k in removed:
+        print(f"  - {k!r} ({section})")
+    total = sum(len(keys) for keys in keywords.values())
+    print(f"{len(removed)} of {total} keywords are redundant after normalization")
+
+    if removed and not args.dry_run:
+        tmp_path = args.keywords_file + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(compacted, f, indent=4)
+        os.replace(tmp_path, args.keywords_file)
+        print(f"📝 Updated {args.keywords_file}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,103 @@
+# result_cache.py
+#-----------------------------------------------------------
+# Memoized item -> section results for the Categorizer
+#
+# The same lines ("milk", "bananas", "Coke") show up on nearly every
+# list, so their results are cached by normalized item text (before
+# singularizing, which can decide score ties).  The
+# in-memory tier is a bounded LRU; an optional JSON file keeps the
+# most recent entries between runs.  Every entry belongs to one
+# configuration version (a hash of keywords.json + sections.json) and
+# the whole cache is dropped as soon as that version changes.
+#-----------------------------------------------------------
+
+import json
+import os
+from collections import OrderedDict
+
+DEFAULT_MAX_SIZE = 10000
+CACHE_FORMAT = 1
+
+
+class ResultCache:
+    """Bounded LRU cache of item text -> section with optional persistence"""
+
+    def __init__(self, max_size=DEFAULT_MAX_SIZE, path=None):
+        self.max_size = max_size
+        self.path = path
+        self.version = None
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def set_version(self, version):
+        """Bind the cache to a configuration version, invalidating on change"""
+        if version == self.version:
+            return
+        self.version = version
+        self.entries.clear()
+        if self.path:
+            self._load()
+
+    def get(self, key):
+        """Return the cached section for key, or None on a miss"""
+        section = self.entries.get(key)
+        if section is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return section
+
+    def put(self, key, section):
+        self.entries[key] = section
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        self.entries.clear()
+
+    def stats(self):
+        """Return hit/miss counters as a dict"""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "size": len(self.entries),
+            "max_size": self.max_size,
+        }
+
+    def _load(self):
+        """Load the persistent tier if it matches the current version"""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get("format") != CACHE_FORMAT or data.get("version") != self.version:
+            return
+        # Stored oldest first, so the LRU order survives the round trip
+        for key, section in data.get("entries", [])[-self.max_size:]:
+            self.entries[key] = section
+
+    def save(self):
+        """Write the in-memory entries to the persistent tier (atomically)"""
+        if not self.path or self.version is None:
+            return
+        data = {
+            "format": CACHE_FORMAT,
+            "version": self.version,
+            "entries": list(self.entries.items()),
+        }
+        tmp_path = self.path + ".tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp_path, self.path)
+        except OSError:
+            pass
@@ -0,0 +1,80 @@
+# review_queue.py
+#-----------------------------------------------------------
+# Persistent queue of unsorted items awaiting review
+#
+# grocery-list.py --defer writes the checklist straight away, leaving
+# unknown items in the "Unsorted / New Items" section, and appends them
+# here (one JSON line per item) instead of prompting for each one:
+#
+#   {"item": "bartlett pears", "added": "2026-10-17", "store": null}
+#
+# store is the --store profile the item came from (null for the base
+# layout), so its keyword is later learned in the right place.  The
+# queue is worked through in bulk with grocery-list.py --review or the
+# section editor's Review Queue dialog; items that are sorted are
+# removed, skipped ones stay queued.
+#-----------------------------------------------------------
+
+import json
+import os
+import time
+
+from keyword_journal import append_lines
+from normalize import normalize
+
+QUEUE_FILE = "review_queue.jsonl"
+
+
+def read_queue(queue_file=QUEUE_FILE):
+    """Return the queued entries, oldest first, one per normalized item
+
+    A torn trailing line (crash during an append) is ignored.
+    """
+    entries = []
+    seen = set()
+    try:
+        with open(queue_file, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                    key = (normalize(entry["item"]), entry.get("store"))
+                except (ValueError, KeyError, TypeError):
+                    continue
+                if key not in seen:
+                    seen.add(key)
+                    entries.append(entry)
+    except FileNotFoundError:
+        pass
+    return entries
+
+
+def enqueue(items, store=None, queue_file=QUEUE_FILE):
+    """Append items not already queued for store; return how many were added"""
+    queued = {normalize(entry["item"]) for entry in read_queue(queue_file)
+              if entry.get("store") == store}
+    added = time.strftime("%Y-%m-%d")
+    lines = []
+    for item in items:
+        key = normalize(item)
+        if key in queued:
+            continue
+        queued.add(key)
+        lines.append(json.dumps({"item": item, "added": added, "store": store},
+                                ensure_ascii=False))
+    append_lines(queue_file, lines)
+    return len(lines)
+
+
+def write_queue(entries, queue_file=QUEUE_FILE):
+    """Atomically replace the queue with entries (removing it when empty)"""
+    if not entries:
+        try:
+            os.unlink(queue_file)
+        except FileNotFoundError:
+            pass
+        return
+    tmp_path = queue_file + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        for entry in entries:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+    os.replace(tmp_path, queue_file)
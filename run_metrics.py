@@ -0,0 +1,123 @@
+# run_metrics.py
+#-----------------------------------------------------------
+# Per-phase metrics report for grocery-list.py --metrics
+#
+# Every phase of a run (clipboard, loading, categorization, prompts,
+# output) records wall time, CPU time, items processed and the
+# categorizer's work counters (items scored, keywords scanned, keyword
+# matches, fuzzy corrections) accumulated during the phase.  The report
+# is written as JSON at the end of the run.
+#
+# Phases named in profile_phases additionally run under cProfile; the
+# stats are dumped for pstats/snakeviz and the top functions are
+# included in the report.  Only imported when --metrics is given.
+#-----------------------------------------------------------
+
+import json
+import sys
+import time
+
+# Functions from the cProfile stats listed in the JSON report
+HOT_PATH_TOP = 15
+
+
+class _MetricsPhase:
+    """Context manager measuring one named phase"""
+
+    def __init__(self, metrics, name, inner=None):
+        self.metrics = metrics
+        self.name = name
+        self.inner = inner
+        # Set by the caller when the phase handles items outside the categorizer
+        self.items = None
+
+    def __enter__(self):
+        if self.inner is not None:
+            self.inner.__enter__()
+        self.counters_before = dict(self.metrics.counters)
+        self.profile = self.metrics._start_profile(self.name)
+        self.wall_start = time.perf_counter()
+        self.cpu_start = time.process_time()
+        return self
+
+    def __exit__(self, *exc):
+        wall = time.perf_counter() - self.wall_start
+        cpu = time.process_time() - self.cpu_start
+        if self.profile is not None:
+            self.profile.disable()
+        before = self.counters_before
+        record = {"name": self.name, "wall_s": round(wall, 6), "cpu_s": round(cpu, 6)}
+        for key, value in self.metrics.counters.items():
+            record[key] = value - before.get(key, 0)
+        record["items"] = self.items if self.items is not None else record.get("items_scored", 0)
+        self.metrics.phases.append(record)
+        if self.inner is not None:
+            self.inner.__exit__(*exc)
+        return False
+
+
+class RunMetrics:
+    """Collects phase records and writes the JSON report"""
+
+    def __init__(self, counters, profile_phases=(), profile_file=None):
+        # counters: the dict the Categorizer increments (Categorizer.counters)
+        self.counters = counters
+        self.phases = []
+        self.profile_phases = set(profile_phases) if profile_file else set()
+        self.profile_file = profile_file
+        self._profiler = None
+        self.wall_start = time.perf_counter()
+        self.cpu_start = time.process_time()
+
+    def phase(self, name, inner=None):
+        """Return a context manager that records name; inner is entered too"""
+        return _MetricsPhase(self, name, inner)
+
+    def _start_profile(self, name):
+        if name not in self.profile_phases:
+            return None
+        if self._profiler is None:
+            import cProfile
+
+            self._profiler = cProfile.Profile()
+        self._profiler.enable()
+        return self._profiler
+
+    def hot_path(self):
+        """Return the top functions by own time from the cProfile stats"""
+        import pstats
+
+        stats = pstats.Stats(self._profiler)
+        rows = []
+        for (filename, line, function), (_, calls, tottime, cumtime, _) in stats.stats.items():
+            rows.append({
+                "function": f"{filename}:{line}({function})",
+                "calls": calls,
+                "tottime_s": round(tottime, 6),
+                "cumtime_s": round(cumtime, 6),
+            })
+        rows.sort(key=lambda row: row["tottime_s"], reverse=True)
+        return rows[:HOT_PATH_TOP]
+
+    def report(self, **extra):
+        """Return the full report as a dict; extra keys are added as is"""
+        report = {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "argv": sys.argv[1:],
+            "total_wall_s": round(time.perf_counter() - self.wall_start, 6),
+            "total_cpu_s": round(time.process_time() - self.cpu_start, 6),
+            "phases": self.phases,
+            "totals": dict(self.counters),
+        }
+        report.update(extra)
+        if self._profiler is not None:
+            report["profile_file"] = self.profile_file
+            report["hot_path"] = self.hot_path()
+        return report
+
+    def write(self, path, **extra):
+        """Write the report to path (and the cProfile stats, if any)"""
+        if self._profiler is not None:
+            self._profiler.dump_stats(self.profile_file)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.report(**extra), f, indent=4)
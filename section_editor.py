@@ -3,6 +3,21 @@ from tkinter import messagebox
 import json
 import os
 
+from keyword_journal import append_keywords, compact, journal_path_for
+from keyword_search import KeywordSearchIndex
+from review_queue import read_queue, write_queue
+
+# Sections added to the listbox per idle callback while a layout loads
+LOAD_CHUNK = 500
+
+# Minimum delay between drag highlight redraws (milliseconds)
+DRAG_REDRAW_MS = 30
+
+# Keyword search runs once typing pauses this long (milliseconds)
+SEARCH_DELAY_MS = 120
+
+ALL_SECTIONS = "All sections"
+
 
 class SectionEditor:
     def __init__(self, root):
@@ -11,8 +26,18 @@ class SectionEditor:
         self.root.geometry("500x600")
         
         self.sections_file = "sections.json"
+        self.keywords_file = "keywords.json"
         self.sections = []
         self.drag_start_index = None
+        # Listbox rows [0, loaded) mirror self.sections; the rest are
+        # appended in chunks from idle callbacks
+        self.loaded = 0
+        self.load_job = None
+        # Drag highlight: row currently shown, row under the pointer and
+        # the pending throttled redraw
+        self.drag_shown = None
+        self.drag_target = None
+        self.drag_job = None
         
         # Load sections
         self.load_sections()
@@ -103,19 +128,65 @@ class SectionEditor:
         tk.Button(button_frame, text="Save", command=self.save_sections,
                  bg="#FF9800", fg="white", font=("Arial", 10, "bold"),
                  width=10).grid(row=0, column=3, padx=5)
+        
+        tk.Button(button_frame, text="Review Queue", command=self.open_review_queue,
+                 bg="#9C27B0", fg="white", font=("Arial", 10, "bold"),
+                 width=14).grid(row=1, column=0, columnspan=2, pady=(8, 0))
+        
+        tk.Button(button_frame, text="Keywords", command=self.open_keyword_pane,
+                 bg="#607D8B", fg="white", font=("Arial", 10, "bold"),
+                 width=14).grid(row=1, column=2, columnspan=2, pady=(8, 0))
     
     def refresh_listbox(self):
-        """Refresh the listbox with current sections"""
+        """Reload the listbox from self.sections, a chunk at a time"""
+        if self.load_job is not None:
+            self.root.after_cancel(self.load_job)
+            self.load_job = None
         self.listbox.delete(0, tk.END)
-        for section in self.sections:
-            self.listbox.insert(tk.END, section)
+        self.loaded = 0
+        self.load_next_chunk()
+    
+    def load_next_chunk(self):
+        """Append the next LOAD_CHUNK sections, rescheduling until all are shown"""
+        self.load_job = None
+        chunk = self.sections[self.loaded:self.loaded + LOAD_CHUNK]
+        if chunk:
+            self.listbox.insert(tk.END, *chunk)
+            self.loaded += len(chunk)
+        if self.loaded < len(self.sections):
+            self.load_job = self.root.after_idle(self.load_next_chunk)
+    
+    def load_through(self, index):
+        """Make sure rows up to index are in the listbox"""
+        if index >= self.loaded:
+            self.listbox.insert(tk.END, *self.sections[self.loaded:index + 1])
+            self.loaded = index + 1
+    
+    def row_inserted(self, index):
+        """Show self.sections[index], just inserted"""
+        # Rows past the loaded prefix are picked up by load_next_chunk()
+        if index <= self.loaded:
+            self.listbox.insert(index, self.sections[index])
+            self.loaded += 1
+    
+    def row_deleted(self, index):
+        """Drop the row of a section just removed from self.sections"""
+        if index < self.loaded:
+            self.listbox.delete(index)
+            self.loaded -= 1
+    
+    def row_changed(self, index):
+        """Redraw the row of the section at index"""
+        if index < self.loaded:
+            self.listbox.delete(index)
+            self.listbox.insert(index, self.sections[index])
     
     def add_section(self):
         """Add a new section to the end"""
         section = self.entry.get().strip()
         if section:
             self.sections.append(section)
-            self.refresh_listbox()
+            self.load_through(len(self.sections) - 1)
             self.entry.delete(0, tk.END)
             self.listbox.selection_clear(0, tk.END)
             self.listbox.selection_set(tk.END)
@@ -135,7 +206,7 @@ class SectionEditor:
         if selection:
             index = selection[0]
             self.sections.insert(index, section)
-            self.refresh_listbox()
+            self.row_inserted(index)
             self.entry.delete(0, tk.END)
             self.listbox.selection_clear(0, tk.END)
             self.listbox.selection_set(index)
@@ -151,7 +222,7 @@ class SectionEditor:
             if messagebox.askyesno("Confirm Delete", 
                                   f"Delete '{section_name}'?"):
                 del self.sections[index]
-                self.refresh_listbox()
+                self.row_deleted(index)
         else:
             messagebox.showwarning("Warning", "Please select a section to delete")
     
@@ -181,7 +252,7 @@ class SectionEditor:
                 new_value = edit_entry.get().strip()
                 if new_value:
                     self.sections[index] = new_value
-                    self.refresh_listbox()
+                    self.row_changed(index)
                     self.listbox.selection_set(index)
                     dialog.destroy()
                 else:
@@ -197,22 +268,237 @@ class SectionEditor:
             tk.Button(btn_frame, text="Cancel", command=dialog.destroy,
                      bg="#f44336", fg="white", width=10).pack(side=tk.LEFT, padx=5)
     
+    def open_review_queue(self):
+        """Sort items queued by grocery-list.py --defer"""
+        entries = read_queue()
+        # Only the base layout's items; profile items are reviewed with --store
+        pending = [entry for entry in entries if entry.get("store") is None]
+        others = [entry for entry in entries if entry.get("store") is not None]
+        if not pending:
+            messagebox.showinfo("Review Queue", "No items waiting for review")
+            return
+        
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Review Queue")
+        dialog.geometry("600x450")
+        dialog.transient(self.root)
+        dialog.grab_set()
+        
+        tk.Label(dialog, text="Select an item and its section, then Assign",
+                font=("Arial", 10)).pack(pady=5)
+        
+        lists_frame = tk.Frame(dialog)
+        lists_frame.pack(padx=10, fill=tk.BOTH, expand=True)
+        
+        item_list = tk.Listbox(lists_frame, font=("Arial", 10), exportselection=False)
+        item_list.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=(0, 5))
+        item_list.insert(tk.END, *(entry["item"] for entry in pending))
+        
+        section_list = tk.Listbox(lists_frame, font=("Arial", 10), exportselection=False)
+        section_list.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        section_list.insert(tk.END, *self.sections)
+        
+        learn = tk.BooleanVar(value=True)
+        tk.Checkbutton(dialog, text="Learn item as keyword", variable=learn).pack(pady=5)
+        
+        new_keywords = {}
+        
+        def assign():
+            item_sel = item_list.curselection()
+            section_sel = section_list.curselection()
+            if not item_sel or not section_sel:
+                messagebox.showwarning("Warning", "Select an item and a section",
+                                       parent=dialog)
+                return
+            index = item_sel[0]
+            entry = pending.pop(index)
+            if learn.get():
+                section = self.sections[section_sel[0]]
+                new_keywords.setdefault(section, []).append(entry["item"].lower().strip())
+            item_list.delete(index)
+            if pending:
+                item_list.selection_set(min(index, len(pending) - 1))
+        
+        def apply_and_close():
+            if new_keywords:
+                append_keywords(journal_path_for(self.keywords_file), new_keywords)
+            write_queue(others + pending)
+            dialog.destroy()
+        
+        btn_frame = tk.Frame(dialog)
+        btn_frame.pack(pady=10)
+        
+        tk.Button(btn_frame, text="Assign", command=assign,
+                 bg="#4CAF50", fg="white", width=10).pack(side=tk.LEFT, padx=5)
+        tk.Button(btn_frame, text="Save & Close", command=apply_and_close,
+                 bg="#FF9800", fg="white", width=12).pack(side=tk.LEFT, padx=5)
+        tk.Button(btn_frame, text="Cancel", command=dialog.destroy,
+                 bg="#f44336", fg="white", width=10).pack(side=tk.LEFT, padx=5)
+    
+    def open_keyword_pane(self):
+        """Search, move and delete keywords in keywords.json"""
+        try:
+            # Learned keywords must be in keywords.json before it is rewritten
+            compact(self.keywords_file)
+            with open(self.keywords_file, 'r', encoding='utf-8') as f:
+                index = KeywordSearchIndex(json.load(f))
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to load keywords: {e}")
+            return
+        # Walking order first, then sections only keywords.json knows
+        targets = list(dict.fromkeys(self.sections + index.section_names))
+        
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Keywords")
+        dialog.geometry("700x550")
+        dialog.transient(self.root)
+        dialog.grab_set()
+        
+        search_frame = tk.Frame(dialog)
+        search_frame.pack(pady=5, padx=10, fill=tk.X)
+        
+        tk.Label(search_frame, text="Search:", font=("Arial", 10)).pack(side=tk.LEFT)
+        query = tk.StringVar()
+        search_entry = tk.Entry(search_frame, textvariable=query, font=("Arial", 10))
+        search_entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
+        search_entry.focus()
+        
+        section_filter = tk.StringVar(value=ALL_SECTIONS)
+        tk.OptionMenu(search_frame, section_filter, ALL_SECTIONS, *index.section_names,
+                      command=lambda _: run_search()).pack(side=tk.LEFT)
+        
+        status = tk.Label(dialog, font=("Arial", 9), fg="gray")
+        status.pack()
+        
+        lists_frame = tk.Frame(dialog)
+        lists_frame.pack(padx=10, fill=tk.BOTH, expand=True)
+        
+        scrollbar = tk.Scrollbar(lists_frame)
+        scrollbar.pack(side=tk.LEFT, fill=tk.Y)
+        result_list = tk.Listbox(lists_frame, font=("Arial", 10), selectmode=tk.EXTENDED,
+                                 exportselection=False, yscrollcommand=scrollbar.set)
+        result_list.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=(0, 5))
+        scrollbar.config(command=result_list.yview)
+        
+        target_list = tk.Listbox(lists_frame, font=("Arial", 10), exportselection=False)
+        target_list.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        target_list.insert(tk.END, *targets)
+        
+        # Entry ids of the rows in result_list
+        shown = []
+        search_job = None
+        
+        def run_search():
+            nonlocal search_job
+            search_job = None
+            section = section_filter.get()
+            ids, more = index.search(query.get(),
+                                     None if section == ALL_SECTIONS else section)
+            shown[:] = ids
+            result_list.delete(0, tk.END)
+            result_list.insert(tk.END, *(f"{index.words[i]}  —  {index.sections[i]}"
+                                         for i in ids))
+            status.config(text=f"{len(ids)}{'+' if more else ''} of {len(index)} keywords match"
+                               f"{' (unsaved changes)' if index.changed else ''}")
+        
+        def schedule_search(*_):
+            # Typing fast only searches once the keystrokes pause
+            nonlocal search_job
+            if search_job is not None:
+                dialog.after_cancel(search_job)
+            search_job = dialog.after(SEARCH_DELAY_MS, run_search)
+        
+        query.trace_add('write', schedule_search)
+        
+        def selected_ids():
+            return [shown[row] for row in result_list.curselection()]
+        
+        def move_selected():
+            ids = selected_ids()
+            target_sel = target_list.curselection()
+            if not ids or not target_sel:
+                messagebox.showwarning("Warning", "Select keywords and a target section",
+                                       parent=dialog)
+                return
+            index.move(ids, targets[target_sel[0]])
+            run_search()
+        
+        def delete_selected():
+            ids = selected_ids()
+            if not ids:
+                messagebox.showwarning("Warning", "Select keywords to delete", parent=dialog)
+                return
+            if messagebox.askyesno("Confirm Delete", f"Delete {len(ids)} keywords?",
+                                   parent=dialog):
+                index.delete(ids)
+                run_search()
+        
+        def save_keywords():
+            try:
+                keywords = index.keywords()
+                tmp_path = self.keywords_file + ".tmp"
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    f.write(json.dumps(keywords, indent=4) + "\n")
+                os.replace(tmp_path, self.keywords_file)
+                index.changed = False
+                run_search()
+                messagebox.showinfo("Success", "Keywords saved successfully!", parent=dialog)
+            except Exception as e:
+                messagebox.showerror("Error", f"Failed to save keywords: {e}", parent=dialog)
+        
+        def close():
+            if index.changed and not messagebox.askyesno(
+                    "Unsaved Changes", "Discard unsaved keyword changes?", parent=dialog):
+                return
+            dialog.destroy()
+        
+        dialog.protocol("WM_DELETE_WINDOW", close)
+        
+        btn_frame = tk.Frame(dialog)
+        btn_frame.pack(pady=10)
+        
+        tk.Button(btn_frame, text="Move to Section", command=move_selected,
+                 bg="#2196F3", fg="white", width=14).pack(side=tk.LEFT, padx=5)
+        tk.Button(btn_frame, text="Delete", command=delete_selected,
+                 bg="#f44336", fg="white", width=10).pack(side=tk.LEFT, padx=5)
+        tk.Button(btn_frame, text="Save", command=save_keywords,
+                 bg="#FF9800", fg="white", width=10).pack(side=tk.LEFT, padx=5)
+        tk.Button(btn_frame, text="Close", command=close,
+                 width=10).pack(side=tk.LEFT, padx=5)
+        
+        run_search()
+    
     def on_drag_start(self, event):
         """Start dragging an item"""
         self.drag_start_index = self.listbox.nearest(event.y)
         self.listbox.selection_clear(0, tk.END)
         self.listbox.selection_set(self.drag_start_index)
+        self.drag_shown = self.drag_target = self.drag_start_index
     
     def on_drag_motion(self, event):
         """During drag motion, highlight target position"""
-        current_index = self.listbox.nearest(event.y)
-        self.listbox.selection_clear(0, tk.END)
-        self.listbox.selection_set(current_index)
+        if self.drag_start_index is None:
+            return
+        self.drag_target = self.listbox.nearest(event.y)
+        # Motion events arrive far faster than the highlight needs to move
+        if self.drag_job is None and self.drag_target != self.drag_shown:
+            self.drag_job = self.root.after(DRAG_REDRAW_MS, self.redraw_drag)
+    
+    def redraw_drag(self):
+        """Move the drag highlight to the row under the pointer"""
+        self.drag_job = None
+        if self.drag_target != self.drag_shown:
+            self.listbox.selection_clear(self.drag_shown)
+            self.listbox.selection_set(self.drag_target)
+            self.drag_shown = self.drag_target
     
     def on_drag_release(self, event):
         """Drop the item at the new position"""
         if self.drag_start_index is None:
             return
+        if self.drag_job is not None:
+            self.root.after_cancel(self.drag_job)
+            self.drag_job = None
         
         drop_index = self.listbox.nearest(event.y)
         
@@ -220,8 +506,10 @@ class SectionEditor:
             # Move the section
             section = self.sections.pop(self.drag_start_index)
             self.sections.insert(drop_index, section)
-            self.refresh_listbox()
-            self.listbox.selection_set(drop_index)
+            self.row_deleted(self.drag_start_index)
+            self.row_inserted(drop_index)
+        self.listbox.selection_clear(0, tk.END)
+        self.listbox.selection_set(drop_index)
         
         self.drag_start_index = None
 
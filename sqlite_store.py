@@ -0,0 +1,235 @@
+#!/usr/bin/python3
+# sqlite_store.py
+#-----------------------------------------------------------
+# Optional SQLite storage backend for sections and keywords
+#
+# Holds the layouts of any number of stores in one database file with
+# indexed tables, so a run only reads the rows for the selected store:
+#
+#   stores   (id, name, revision)
+#   sections (id, store_id, name, position)   -- position = walking order
+#   keywords (id, section_id, keyword)
+#
+# revision is bumped on every change and identifies the store's
+# content for the result cache.  Import includes keywords learned into
+# keywords.journal; export refuses to overwrite a keywords.json that
+# still has a journal, whose entries would be overlaid on the export.
+#
+# Usage:
+#   python3 sqlite_store.py grocery.db import --store hyvee
+#   python3 sqlite_store.py grocery.db export --store hyvee --sections s.json --keywords k.json
+#   python3 sqlite_store.py grocery.db list
+#   python3 grocery-list.py --db grocery.db --store hyvee
+#-----------------------------------------------------------
+
+import argparse
+import errno
+import json
+import os
+import sqlite3
+import sys
+from urllib.parse import quote
+
+from keyword_journal import apply_journal, compacting_path, journal_path_for, read_journal
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS stores (
+    id       INTEGER PRIMARY KEY,
+    name     TEXT NOT NULL UNIQUE,
+    revision INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS sections (
+    id       INTEGER PRIMARY KEY,
+    store_id INTEGER NOT NULL REFERENCES stores(id) ON DELETE CASCADE,
+    name     TEXT NOT NULL,
+    position INTEGER,
+    UNIQUE (store_id, name)
+);
+CREATE INDEX IF NOT EXISTS sections_store_position ON sections (store_id, position);
+CREATE TABLE IF NOT EXISTS keywords (
+    id         INTEGER PRIMARY KEY,
+    section_id INTEGER NOT NULL REFERENCES sections(id) ON DELETE CASCADE,
+    keyword    TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS keywords_section ON keywords (section_id);
+"""
+
+
+class StoreNotFoundError(KeyError):
+    pass
+
+
+class SqliteStore:
+    """Sections and keywords for many stores in one SQLite database"""
+
+    def __init__(self, path, create=False):
+        """Open the database at path
+
+        Only create=True (import) makes a new database file; otherwise a
+        missing file raises FileNotFoundError instead of leaving an
+        empty database behind a mistyped --db path.
+        """
+        self.path = path
+        if create:
+            self.conn = sqlite3.connect(path)
+            self.conn.execute("PRAGMA foreign_keys = ON")
+            self.conn.executescript(SCHEMA)
+            return
+        if not os.path.exists(path):
+            raise FileNotFoundError(errno.ENOENT, os.strerror(errno.ENOENT), path)
+        self.conn = sqlite3.connect(f"file:{quote(path)}?mode=rw", uri=True)
+        self.conn.execute("PRAGMA foreign_keys = ON")
+
+    def close(self):
+        self.conn.close()
+
+    def stores(self):
+        """Return [(name, section count, keyword count), ...]"""
+        return self.conn.execute("""
+            SELECT st.name,
+                   (SELECT COUNT(*) FROM sections s WHERE s.store_id = st.id),
+                   (SELECT COUNT(*) FROM keywords k JOIN sections s ON k.section_id = s.id
+                     WHERE s.store_id = st.id)
+              FROM stores st ORDER BY st.name
+        """).fetchall()
+
+    def _store_id(self, store, create=False):
+        row = self.conn.execute("SELECT id FROM stores WHERE name = ?", (store,)).fetchone()
+        if row:
+            return row[0]
+        if not create:
+            raise StoreNotFoundError(store)
+        return self.conn.execute("INSERT INTO stores (name) VALUES (?)", (store,)).lastrowid
+
+    def _bump_revision(self, store_id):
+        self.conn.execute("UPDATE stores SET revision = revision + 1 WHERE id = ?", (store_id,))
+
+    def revision(self, store):
+        """Return the store's change counter"""
+        return self.conn.execute("SELECT revision FROM stores WHERE id = ?",
+                                 (self._store_id(store),)).fetchone()[0]
+
+    def load_sections(self, store):
+        """Return the store's section names in walking order"""
+        rows = self.conn.execute("""
+            SELECT name FROM sections
+             WHERE store_id = ? AND position IS NOT NULL
+             ORDER BY position
+        """, (self._store_id(store),))
+        return [name for (name,) in rows]
+
+    def load_keywords(self, store):
+        """Return {section: [keyword, ...]} for the store"""
+        keywords = {}
+        rows = self.conn.execute("""
+            SELECT s.name, k.keyword
+              FROM keywords k JOIN sections s ON k.section_id = s.id
+             WHERE s.store_id = ?
+             ORDER BY s.id, k.id
+        """, (self._store_id(store),))
+        for section, keyword in rows:
+            keywords.setdefault(section, []).append(keyword)
+        return keywords
+
+    def _section_id(self, store_id, section):
+        row = self.conn.execute("SELECT id FROM sections WHERE store_id = ? AND name = ?",
+                                (store_id, section)).fetchone()
+        if row:
+            return row[0]
+        # Keyword-only section: not part of the walking order
+        return self.conn.execute("INSERT INTO sections (store_id, name) VALUES (?, ?)",
+                                 (store_id, section)).lastrowid
+
+    def add_keywords(self, store, new_keywords):
+        """Add {section: [keyword, ...]} to the store"""
+        with self.conn:
+            store_id = self._store_id(store)
+            for section, keys in new_keywords.items():
+                section_id = self._section_id(store_id, section)
+                self.conn.executemany("INSERT INTO keywords (section_id, keyword) VALUES (?, ?)",
+                                      [(section_id, k) for k in keys])
+            self._bump_revision(store_id)
+
+    def replace_store(self, store, section_names, keywords):
+        """Replace everything stored for store with the given layout"""
+        with self.conn:
+            store_id = self._store_id(store, create=True)
+            self.conn.execute("DELETE FROM sections WHERE store_id = ?", (store_id,))
+            self.conn.executemany(
+                "INSERT INTO sections (store_id, name, position) VALUES (?, ?, ?)",
+                [(store_id, name, position) for position, name in enumerate(section_names)])
+            for section, keys in keywords.items():
+                section_id = self._section_id(store_id, section)
+                self.conn.executemany("INSERT INTO keywords (section_id, keyword) VALUES (?, ?)",
+                                      [(section_id, k) for k in keys])
+            self._bump_revision(store_id)
+
+    def import_json(self, store, sections_file="sections.json", keywords_file="keywords.json"):
+        """Import a sections.json/keywords.json pair (plus its journal) as store"""
+        with open(sections_file, "r", encoding="utf-8") as f:
+            section_names = json.load(f)
+        with open(keywords_file, "r", encoding="utf-8") as f:
+            keywords = json.load(f)
+        apply_journal(keywords, read_journal(journal_path_for(keywords_file)))
+        self.replace_store(store, section_names, keywords)
+
+    def export_json(self, store, sections_file="sections.json", keywords_file="keywords.json"):
+        """Write store back out as a sections.json/keywords.json pair
+
+        Raises FileExistsError if keywords_file has a learned-keyword
+        journal, which would otherwise be overlaid on the export.
+        """
+        journal_file = journal_path_for(keywords_file)
+        for path in (journal_file, compacting_path(journal_file)):
+            if os.path.exists(path):
+                raise FileExistsError(errno.EEXIST, "learned keywords not folded in", path)
+        with open(sections_file, "w", encoding="utf-8") as f:
+            json.dump(self.load_sections(store), f, indent=4)
+        with open(keywords_file, "w", encoding="utf-8") as f:
+            json.dump(self.load_keywords(store), f, indent=4)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage the SQLite keyword/section store")
+    parser.add_argument("db", help="database file")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    for name, help_text in (("import", "import JSON files as a store"),
+                            ("export", "export a store to JSON files")):
+        sub = subparsers.add_parser(name, help=help_text)
+        sub.add_argument("--store", default="default")
+        sub.add_argument("--sections", default="sections.json")
+        sub.add_argument("--keywords", default="keywords.json")
+    subparsers.add_parser("list", help="list stores")
+
+    args = parser.parse_args()
+    try:
+        store = SqliteStore(args.db, create=args.command == "import")
+    except FileNotFoundError:
+        print(f"⚠️ No database {args.db} (create one with: import)", file=sys.stderr)
+        return 1
+    try:
+        if args.command == "import":
+            store.import_json(args.store, args.sections, args.keywords)
+            print(f"✅ Imported {args.sections} + {args.keywords} as store '{args.store}'")
+        elif args.command == "export":
+            store.export_json(args.store, args.sections, args.keywords)
+            print(f"✅ Exported store '{args.store}' to {args.sections} + {args.keywords}")
+        elif args.command == "list":
+            for name, section_count, keyword_count in store.stores():
+                print(f"{name}: {section_count} sections, {keyword_count} keywords")
+    except StoreNotFoundError as e:
+        print(f"⚠️ No store named {e.args[0]!r} in {args.db}", file=sys.stderr)
+        return 1
+    except FileExistsError as e:
+        print(f"⚠️ {e.filename} holds keywords learned since {args.keywords} was last "
+              f"compacted; fold them in (grocery-list.py --compact-journal) or remove it "
+              f"before exporting over {args.keywords}", file=sys.stderr)
+        return 1
+    finally:
+        store.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,88 @@
+# startup_profile.py
+#-----------------------------------------------------------
+# Startup-time breakdown for grocery-list.py --startup-profile
+#
+# Records how long each module import and each phase of a run takes
+# and prints the breakdown to stderr at the end.  Only imported when
+# the flag is given, so normal runs pay nothing for it.
+#-----------------------------------------------------------
+
+import builtins
+import sys
+import time
+
+
+class _Phase:
+    """Context manager timing one named phase"""
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.phases.append((self.name, time.perf_counter() - self.start))
+        return False
+
+
+class StartupProfiler:
+    """Collects per-import and per-phase timings"""
+
+    def __init__(self, start=None):
+        self.start = start if start is not None else time.perf_counter()
+        self.imports = []   # (depth, module name, seconds incl. sub-imports)
+        self.phases = []    # (phase name, seconds)
+        self._depth = 0
+        self._original_import = None
+
+    def install_import_hook(self):
+        """Time every first-time import from now on"""
+        original = builtins.__import__
+        self._original_import = original
+
+        def timed_import(name, globals=None, locals=None, fromlist=(), level=0):
+            if level or name in sys.modules:
+                return original(name, globals, locals, fromlist, level)
+            depth = self._depth
+            # Recorded up front so nested imports are listed under their parent
+            entry = [depth, name, 0.0]
+            self.imports.append(entry)
+            self._depth += 1
+            t0 = time.perf_counter()
+            try:
+                return original(name, globals, locals, fromlist, level)
+            finally:
+                self._depth = depth
+                entry[2] = time.perf_counter() - t0
+
+        builtins.__import__ = timed_import
+
+    def uninstall_import_hook(self):
+        if self._original_import is not None:
+            builtins.__import__ = self._original_import
+            self._original_import = None
+
+    def phase(self, name):
+        """Return a context manager that records the time spent in name"""
+        return _Phase(self, name)
+
+    def report(self, out=None):
+        """Print the import and phase breakdown"""
+        out = out or sys.stderr
+        self.uninstall_import_hook()
+        total = time.perf_counter() - self.start
+
+        print("\n⏱️  Startup profile", file=out)
+        print("Imports (first load, inclusive):", file=out)
+        for depth, name, seconds in self.imports:
+            print(f"  {seconds * 1000:8.2f} ms  {'  ' * depth}{name}", file=out)
+        import_total = sum(seconds for depth, name, seconds in self.imports if depth == 0)
+        print(f"  {import_total * 1000:8.2f} ms  total top-level imports", file=out)
+
+        print("Phases:", file=out)
+        for name, seconds in self.phases:
+            print(f"  {seconds * 1000:8.2f} ms  {name}", file=out)
+        print(f"  {total * 1000:8.2f} ms  total since script start", file=out)
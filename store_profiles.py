@@ -0,0 +1,101 @@
+# store_profiles.py
+#-----------------------------------------------------------
+# Per-store overlays on top of the shared keyword index
+#
+# Instead of copying sections.json/keywords.json per store, a store
+# profile (stores/<name>.json) only records how that store differs:
+#
+#   {
+#       "rename":   {"Produce / Fresh Fruits & Vegetables": "Produce", ...},
+#       "order":    ["Produce", "Bakery", ...],
+#       "keywords": {"Produce": ["plantain"], ...}
+#   }
+#
+# rename   maps base section names to the store's names; several base
+#          sections may map to one store section, and their scores add up.
+# order    is the store's walking order (store names).  Base sections left
+#          out are treated as not stocked.  Defaults to the base order.
+# keywords are extra keywords for this store, keyed by store section.
+#
+# Only the active profile is read, its few extra keywords get their
+# own small matcher, and the shared base matcher is never rebuilt.
+#-----------------------------------------------------------
+
+import hashlib
+import json
+import os
+
+from keyword_matcher import KeywordMatcher
+from normalize import normalize_keywords, plain_forms
+
+STORES_DIR = "stores"
+
+
+def profile_path(name, stores_dir=STORES_DIR):
+    return os.path.join(stores_dir, f"{name}.json")
+
+
+def list_profiles(stores_dir=STORES_DIR):
+    """Return the names of all available store profiles"""
+    try:
+        return sorted(f[:-5] for f in os.listdir(stores_dir) if f.endswith(".json"))
+    except FileNotFoundError:
+        return []
+
+
+class StoreProfile:
+    """One store's renames, walking order and extra keywords"""
+
+    def __init__(self, name, data, base_sections, path=None):
+        self.name = name
+        self.path = path
+        self.data = data
+        self.rename = data.get("rename", {})
+        self.extra_keywords = data.get("keywords", {})
+        self.base_sections = base_sections
+
+        renamed = []
+        for section in base_sections:
+            store_section = self.rename.get(section, section)
+            if store_section not in renamed:
+                renamed.append(store_section)
+        self.section_names = data.get("order") or renamed
+
+        self.matcher = (KeywordMatcher(normalize_keywords(self.extra_keywords))
+                        if self.extra_keywords else None)
+        self.plain_forms = plain_forms(self.extra_keywords)
+        self.digest = hashlib.sha256(
+            json.dumps(data, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def score(self, base_scores, text):
+        """Translate base-section scores to this store and add overlay hits
+
+        text must already be normalized.
+        """
+        rename = self.rename
+        scores = {}
+        for section, score in base_scores.items():
+            store_section = rename.get(section, section)
+            scores[store_section] = scores.get(store_section, 0) + score
+        if self.matcher is not None:
+            for section, score in self.matcher.score(text).items():
+                scores[section] = scores.get(section, 0) + score
+        return scores
+
+    def add_keywords(self, new_keywords):
+        """Add {store section: [keyword, ...]} to this profile and save it"""
+        for section, keys in new_keywords.items():
+            self.extra_keywords.setdefault(section, []).extend(keys)
+        self.data["keywords"] = self.extra_keywords
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.data, f, indent=4)
+        os.replace(tmp_path, self.path)
+
+
+def load_profile(name, base_sections, stores_dir=STORES_DIR):
+    """Load stores/<name>.json as a StoreProfile"""
+    path = profile_path(name, stores_dir)
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    return StoreProfile(name, data, base_sections, path=path)
@@ -0,0 +1,153 @@
+# vector_scoring.py
+#-----------------------------------------------------------
+# Vectorized batch scoring with NumPy (optional dependency)
+#
+# Scoring items one at a time spends most of its time in the
+# interpreter.  For batch jobs a whole chunk of items is instead turned
+# into a sparse item x keyword matrix (CSR: one row per item, a 1 for
+# every keyword it contains) and multiplied by a dense keyword x section
+# weight matrix built once from the keyword index:
+#
+#     scores = X @ W            (items x sections)
+#     best   = argmax(scores)   (first max = earliest in walking order)
+#
+# Normalized text is single-space separated words, so a keyword hits on
+# word boundaries exactly when its words appear as a run of the item's
+# words; the matrix is filled from those word n-grams instead of the
+# character automaton.  Results are identical to Categorizer.categorize,
+# including store profiles; items with no exact hit (fuzzy fallback)
+# or with a tied top score (tie-break on the plain text) go through the
+# scalar path.  Keyword hits are recorded in the
+# Categorizer's keyword_stats exactly as the scalar path records them.
+#-----------------------------------------------------------
+
+import numpy as np
+
+from categorizer import UNSORTED_SECTION
+from normalize import normalize_plain, singularize_text
+
+
+class VectorScorer:
+    """Keyword x section weight matrix for one Categorizer layout"""
+
+    def __init__(self, categorizer):
+        self.categorizer = categorizer
+        columns = {}
+        for section in categorizer.section_names:
+            columns.setdefault(section, len(columns))
+        self.section_names = list(columns)
+
+        profile = categorizer.profile
+        rename = profile.rename if profile is not None else {}
+        matchers = [(matcher, rename) for matcher in categorizer.index.matchers]
+        if profile is not None and profile.matcher is not None:
+            # Overlay keywords are already keyed by store section
+            matchers.append((profile.matcher, {}))
+
+        base_matchers = len(categorizer.index.matchers)
+        self.keyword_ids = {}   # normalized keyword -> row of weights
+        # Per keyword row, for keyword_stats: the keywords.json/journal
+        # (matcher, keyword id) pairs it stands for; overlay keywords
+        # aren't recorded, as in Categorizer._scores
+        self.stat_ids = []
+        rows = []
+        for m, (matcher, section_map) in enumerate(matchers):
+            for mid, (k, sections) in enumerate(zip(matcher.keywords, matcher.sections)):
+                kid = self.keyword_ids.get(k)
+                if kid is None:
+                    kid = self.keyword_ids[k] = len(rows)
+                    rows.append([0] * len(columns))
+                    self.stat_ids.append([])
+                if m < base_matchers:
+                    self.stat_ids[kid].append((matcher, mid))
+                for section in sections:
+                    column = columns.get(section_map.get(section, section))
+                    if column is not None:
+                        rows[kid][column] += 1
+        self.weights = np.array(rows, dtype=np.int32).reshape(len(rows), len(columns))
+
+        # Every leading run of words of a keyword, to stop n-gram growth early
+        self.prefixes = set()
+        self.max_words = 1
+        for k in self.keyword_ids:
+            words = k.split()
+            self.max_words = max(self.max_words, len(words))
+            for n in range(1, len(words)):
+                self.prefixes.add(" ".join(words[:n]))
+
+    def keyword_hits(self, text):
+        """Return the ids of the keywords found in normalized text"""
+        keyword_ids = self.keyword_ids
+        prefixes = self.prefixes
+        words = text.split()
+        found = set()
+        for start in range(len(words)):
+            gram = words[start]
+            end = start + 1
+            while True:
+                kid = keyword_ids.get(gram)
+                if kid is not None:
+                    found.add(kid)
+                if end == len(words) or end - start == self.max_words or gram not in prefixes:
+                    break
+                gram = gram + " " + words[end]
+                end += 1
+        return found
+
+    def matrix(self, texts):
+        """Return the CSR (indptr, indices) item x keyword matrix for texts"""
+        indptr = [0]
+        indices = []
+        for text in texts:
+            indices.extend(self.keyword_hits(text))
+            indptr.append(len(indices))
+        return np.array(indptr, dtype=np.intp), np.array(indices, dtype=np.intp)
+
+    def scores(self, texts):
+        """Return the items x sections score matrix for normalized texts"""
+        return self._scores(*self.matrix(texts))
+
+    def _scores(self, indptr, indices):
+        # Sparse @ dense as a segment sum over each item's weight rows
+        totals = np.zeros((len(indices) + 1, self.weights.shape[1]), dtype=np.int64)
+        np.cumsum(self.weights[indices], axis=0, out=totals[1:])
+        return totals[indptr[1:]] - totals[indptr[:-1]]
+
+    def categorize_many(self, items):
+        """Return the section for each item, in order"""
+        if not items:
+            return []
+        plains = [normalize_plain(item) for item in items]
+        texts = [singularize_text(plain) for plain in plains]
+        if not self.section_names:
+            return [UNSORTED_SECTION] * len(items)
+        indptr, indices = self.matrix(texts)
+        scores = self._scores(indptr, indices)
+        counters = self.categorizer.counters
+        if counters is not None:
+            counters["items_scored"] += len(texts)
+            counters["keywords_scanned"] += len(texts) * len(self.keyword_ids)
+            counters["matches"] += int(scores.sum())
+        best = scores.argmax(axis=1)
+        top = scores[np.arange(len(texts)), best]
+        tied = (scores == top[:, None]).sum(axis=1) > 1
+        decided = ((top > 0) & ~tied).tolist()
+        if self.categorizer.keyword_stats is not None:
+            self._record(indptr.tolist(), indices.tolist(), decided)
+        section_names = self.section_names
+        best_section = self.categorizer._best_section
+        return [section_names[column] if done else best_section(text, plain)
+                for column, done, text, plain in zip(best.tolist(), decided, texts, plains)]
+
+    def _record(self, indptr, indices, decided):
+        """Record the keyword hits of the items decided here
+
+        Other items are recorded by the scalar path instead.
+        """
+        record = self.categorizer.keyword_stats.record
+        stat_ids = self.stat_ids
+        for row, done in enumerate(decided):
+            if done:
+                for kid in indices[indptr[row]:indptr[row + 1]]:
+                    for matcher, mid in stat_ids[kid]:
+                        record(matcher, (mid,))